@@ -0,0 +1,5 @@
+from PyInstaller.utils.hooks import collect_dynamic_libs, collect_submodules
+
+# The interpreter is a compiled extension plus shared libraries loaded at runtime
+binaries = collect_dynamic_libs('ai_edge_litert')
+hiddenimports = collect_submodules('ai_edge_litert')
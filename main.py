@@ -1,8 +1,22 @@
+import argparse
 import sys
-from PyQt6.QtWidgets import (QApplication)
-from src.ui.gui import MainWindow
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    parser = argparse.ArgumentParser(description="EmergenSee AI Assistant")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run the headless HTTP query server instead of the desktop app")
+    parser.add_argument("--host", help="Query server address (default: AppConfig.QUERY_SERVER_HOST)")
+    parser.add_argument("--port", type=int, help="Query server port (default: AppConfig.QUERY_SERVER_PORT)")
+    args, qt_args = parser.parse_known_args()
+
+    if args.serve:
+        # No Qt, camera or TensorFlow in server mode
+        from src.services.query_server import serve
+        serve(args.host, args.port)
+    else:
+        from PyQt6.QtWidgets import (QApplication)
+        from src.ui.gui import MainWindow
+        app = QApplication(sys.argv[:1] + qt_args)
+        window = MainWindow()
+        window.show()
+        sys.exit(app.exec())
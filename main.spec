@@ -1,5 +1,11 @@
 # main.spec
 # -*- mode: python ; coding: utf-8 -*-
+import importlib.util
+
+# TensorFlow is left out of the bundle (see excludes), so the "tflite" backend
+# needs the standalone LiteRT interpreter from requirements.txt.
+if importlib.util.find_spec('ai_edge_litert') is None:
+    raise SystemExit("ai-edge-litert is not installed; run 'pip install -r requirements.txt' before building.")
 
 a = Analysis(
     ['main.py'],
@@ -10,12 +16,15 @@ a = Analysis(
         ('models', 'models'),
         ('config', 'config')
     ],
-    hiddenimports=[],
+    hiddenimports=['ai_edge_litert.interpreter'], # Imported lazily by the tflite backend
     # This is the crucial part that tells PyInstaller to use our new hook
     hookspath=['hooks'],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # The "numpy", "knn" and "centroid" backends never import TensorFlow, and
+    # "tflite" runs on the bundled ai-edge-litert interpreter instead, so TF is
+    # left out of the bundle. Empty this list for INFERENCE_BACKEND = "keras".
+    excludes=['tensorflow', 'keras', 'tensorboard', 'jax', 'jaxlib'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     noarchive=False,
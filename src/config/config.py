@@ -17,14 +17,68 @@ class AppConfig:
     """
     # File Paths
     MODEL_PATH = resource_path("models/sibi_asl_robust_model.h5")
+    TFLITE_MODEL_PATH = resource_path("models/sibi_asl_robust_model_fp16.tflite") # Made by src/tools/export_tflite.py
+    NEIGHBOR_DATASET_PATH = resource_path("models/sibi_alphabet_landmarks") # Normalized dataset for "knn"/"centroid"
     LABELS_PATH = resource_path("config/labels.json")
-    KNOWLEDGE_BASE_PATH = resource_path("config/mall_knowledge_base.json")
+    KNOWLEDGE_BASE_PATH = resource_path("config/knowledge_base.json")
     NLP_CONFIG_PATH = resource_path("config/nlp_config.json")
+    LETTER_CONFUSIONS_PATH = resource_path("config/letter_confusions.json")
+    MALL_GRAPH_PATH = resource_path("config/mall_graph.json")
     RECORDED_SIGNS_PATH = "recorded_signs.csv" 
+    KNOWLEDGE_RELOAD_INTERVAL = 2.0 # Seconds between checks for edited knowledge files; None disables hot reload
 
     # Recognizer Parameters
+    INFERENCE_BACKEND = "numpy" # "numpy" (no TensorFlow at runtime), "tflite", "keras", "knn" or "centroid"; see classifier_backends.py
+    TFLITE_NUM_THREADS = 1 # The model is tiny; extra threads only add overhead per call
+    KNN_NEIGHBORS = 5 # Training samples voting in the "knn" backend
     CONFIDENCE_THRESHOLD = 0.4
     SEQUENCE_LENGTH = 15
+    PREDICTION_MODE = "last_frame" # "last_frame" or "window" (one batched call per landmark window)
+    WINDOW_AGGREGATION = "weighted" # "majority", "mean" or "weighted" (confidence-weighted mean)
+
+    # Hand Tracking Parameters
+    ROI_TRACKING = True # Run MediaPipe on a box around the last detected hand
+    ROI_PADDING = 0.3 # Extra margin on each side, as a fraction of the hand size
+    ROI_MIN_SIZE = 128 # Smallest ROI side in pixels
+    ROI_INPUT_SIZE = 256 # Longest side of the ROI crop fed to MediaPipe
+    FULL_FRAME_INPUT_SIZE = 640 # Longest side of the frame fed to MediaPipe when searching
+
+    # Adaptive Inference Parameters
+    ADAPTIVE_INFERENCE = True # False runs the model on a fixed every-3rd-frame cadence
+    MOTION_STILL_THRESHOLD = 0.02 # Mean landmark displacement below which the pose counts as held
+    MOTION_TRANSITION_THRESHOLD = 0.08 # Mean landmark displacement above which the hand is changing letters
+    INFERENCE_BASE_INTERVAL = 0.1 # Seconds between predictions for moderate motion
+    INFERENCE_TRANSITION_INTERVAL = 0.033 # Seconds between predictions during transitions
+    INFERENCE_HOLD_INTERVAL = 0.6 # Seconds between predictions while a pose is held
+    MAX_INFERENCES_PER_SECOND = 15 # CPU budget across all motion levels
+
+    # Camera Pipeline Parameters
+    PIPELINE_QUEUE_SIZE = 2 # Frames waiting between stages; older frames are dropped
+    DISPLAY_FPS = 20 # Preview frame rate, independent of the processing rate
+
+    # Metrics Parameters (probes are compiled out unless enabled before startup)
+    METRICS_ENABLED = os.environ.get("EMERGENSEE_METRICS") == "1"
+    METRICS_EXPORT_PATH = "metrics.prom" # Prometheus text file, rewritten periodically; None to disable
+    METRICS_EXPORT_INTERVAL = 15 # Seconds between file exports
+    METRICS_HTTP_PORT = None # e.g. 9464 to serve http://127.0.0.1:9464/metrics
+
+    # Kiosk Parameters
+    STAND_ID = "stand_pintu_timur" # Default stand answered for; the query API can pass any stand per request
+    QUERY_CACHE_SIZE = 512 # Finished (question, stand) results kept for repeat questions; 0 disables the cache
+
+    # Query Server Parameters (python main.py --serve)
+    QUERY_SERVER_HOST = "127.0.0.1" # Loopback only; put a reverse proxy in front to expose it
+    QUERY_SERVER_PORT = 8765
+    QUERY_BATCH_MAX_SIZE = 32 # Sentences answered together in one worker call
+    QUERY_BATCH_WINDOW = 0.005 # Seconds to wait for more sentences before answering a batch
+
+    # Text Correction Parameters
+    SEGMENTATION_MAX_EDITS = 2 # Most letter edits tolerated in one word (words under 4 letters must match exactly)
+    FUZZY_MAX_EDITS = 2 # Edit distance searched when resolving a single noisy word
+    FUZZY_MIN_WORD_LENGTH = 4 # Shorter words are never fuzzy-matched
+    SUGGESTION_LIMIT = 5 # Autocomplete entries shown while typing
+    SUGGESTION_DEBOUNCE_MS = 150 # Typing pause before suggestions are looked up
 
     # Sentence Building Parameters
     STABILITY_THRESHOLD = 3
+    WINDOW_STABILITY_THRESHOLD = 1 # A window prediction already spans SEQUENCE_LENGTH frames
@@ -0,0 +1,64 @@
+# classifier_backends.py
+"""
+The classifier backends SignRecognizer can run, selected by
+AppConfig.INFERENCE_BACKEND.
+
+A backend is any object with predict(batch, verbose=0), taking an
+(N, 21, 3) float32 batch of normalized landmarks and returning (N,
+num_classes) probabilities in the order of config/labels.json, like
+keras.Model.predict. Each entry of CLASSIFIER_BACKENDS is a loader,
+loader(class_names) -> backend. Heavy dependencies are imported inside
+the loaders, so only the selected backend's are ever loaded.
+"""
+
+from src.config.config import AppConfig
+
+
+def _load_numpy(class_names):
+    from src.core.numpy_classifier import NumpyClassifier
+    return NumpyClassifier(AppConfig.MODEL_PATH)
+
+
+def _load_keras(class_names):
+    from tensorflow.keras.models import load_model
+    return load_model(AppConfig.MODEL_PATH)
+
+
+def _load_tflite(class_names):
+    from src.core.tflite_classifier import TFLiteClassifier
+    return TFLiteClassifier(AppConfig.TFLITE_MODEL_PATH, AppConfig.TFLITE_NUM_THREADS)
+
+
+def _load_knn(class_names):
+    from src.core.landmark_dataset import LandmarkDataset
+    from src.core.neighbor_classifiers import NearestNeighborClassifier, training_arrays
+    landmarks, labels = training_arrays(LandmarkDataset(AppConfig.NEIGHBOR_DATASET_PATH), class_names)
+    return NearestNeighborClassifier(landmarks, labels, len(class_names), AppConfig.KNN_NEIGHBORS)
+
+
+def _load_centroid(class_names):
+    from src.core.landmark_dataset import LandmarkDataset
+    from src.core.neighbor_classifiers import NearestCentroidClassifier, training_arrays
+    landmarks, labels = training_arrays(LandmarkDataset(AppConfig.NEIGHBOR_DATASET_PATH), class_names)
+    return NearestCentroidClassifier(landmarks, labels, len(class_names))
+
+
+CLASSIFIER_BACKENDS = {
+    "numpy": _load_numpy, # The .h5 model's forward pass in NumPy
+    "keras": _load_keras, # The .h5 model through TensorFlow
+    "tflite": _load_tflite, # A TFLite export of the model
+    "knn": _load_knn, # k-nearest neighbours over NEIGHBOR_DATASET_PATH
+    "centroid": _load_centroid, # Nearest class centroid over NEIGHBOR_DATASET_PATH
+}
+
+
+def register_backend(name, loader):
+    """Adds or replaces a backend, e.g. from an experiment script before SignRecognizer is created."""
+    CLASSIFIER_BACKENDS[name] = loader
+
+
+def load_classifier(backend, class_names):
+    if backend not in CLASSIFIER_BACKENDS:
+        raise ValueError(f"Unknown inference backend: '{backend}'")
+    print(f"Using {backend} inference backend.")
+    return CLASSIFIER_BACKENDS[backend](class_names)
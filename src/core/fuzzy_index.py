@@ -0,0 +1,175 @@
+# fuzzy_index.py
+
+import json
+from itertools import combinations
+
+
+def load_confusion_costs(path):
+    """Loads the letter confusion table from a file; see parse_confusion_costs."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Warning: Letter confusions not loaded from '{path}'. Details: {e}")
+        data = {}
+    return parse_confusion_costs(data)
+
+
+def parse_confusion_costs(data):
+    """
+    Returns ({(a, b): cost} with both orders present, default substitution
+    cost) from the letter confusion JSON. An empty table makes every
+    substitution cost the default.
+    """
+    costs = {}
+    for first, second, cost in data.get('pairs', []):
+        costs[(first, second)] = costs[(second, first)] = float(cost)
+    return costs, float(data.get('default_substitution_cost', 1.0))
+
+
+def weighted_edit_distance(source, target, substitution_costs=None, default_cost=1.0, max_cost=None):
+    """
+    Damerau-Levenshtein distance where substituting one letter for another
+    costs substitution_costs[(a, b)] (or `default_cost`); insertions,
+    deletions and adjacent transpositions cost 1. Returns None as soon as
+    the distance is known to exceed `max_cost`.
+    """
+    substitution_costs = substitution_costs or {}
+    previous_previous = None
+    previous = [float(j) for j in range(len(target) + 1)]
+    for i in range(1, len(source) + 1):
+        current = [float(i)] + [0.0] * len(target)
+        source_char = source[i - 1]
+        for j in range(1, len(target) + 1):
+            target_char = target[j - 1]
+            if source_char == target_char:
+                substitution = previous[j - 1]
+            else:
+                substitution = previous[j - 1] + substitution_costs.get((source_char, target_char), default_cost)
+            best = min(previous[j] + 1, current[j - 1] + 1, substitution)
+            if (previous_previous is not None and j > 1 and source_char == target[j - 2]
+                    and source[i - 2] == target_char):
+                best = min(best, previous_previous[j - 2] + 1)
+            current[j] = best
+        if max_cost is not None and min(current) > max_cost:
+            return None
+        previous_previous, previous = previous, current
+    distance = previous[-1]
+    if max_cost is not None and distance > max_cost:
+        return None
+    return distance
+
+
+class FuzzyIndex:
+    """
+    A SymSpell-style index for finding vocabulary words close to a noisy one.
+
+    Every word is stored under all the strings obtained by deleting up to
+    `max_edits` letters from its first `prefix_length` letters. A lookup
+    generates the same deletions for the query, so every word within
+    `max_edits` edits shares at least one of them; only those few candidates
+    are then scored with the confusion-weighted edit distance.
+    """
+    def __init__(self, words, max_edits=2, substitution_costs=None, default_cost=1.0, prefix_length=7):
+        self.max_edits = max_edits
+        self.prefix_length = prefix_length
+        self.substitution_costs = substitution_costs or {}
+        self.default_cost = default_cost
+        self.words = set()
+        self._deletes = {} # deleted variant -> [words]
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _variants(self, word):
+        """All strings made by deleting up to max_edits letters from the word's prefix."""
+        prefix = word[:self.prefix_length]
+        variants = set()
+        for count in range(min(self.max_edits, len(prefix)) + 1):
+            for positions in combinations(range(len(prefix)), count):
+                variants.add("".join(c for i, c in enumerate(prefix) if i not in positions))
+        return variants
+
+    def add(self, word):
+        if not word or word in self.words:
+            return
+        self.words.add(word)
+        for variant in self._variants(word):
+            self._deletes.setdefault(variant, []).append(word)
+
+    def lookup(self, term, max_cost=None):
+        """
+        Returns [(word, cost)] for the words within max_edits plain edits of
+        `term` whose weighted cost is at most `max_cost` (default: max_edits),
+        cheapest first, then alphabetically.
+        """
+        max_cost = self.max_edits if max_cost is None else max_cost
+        candidates = set()
+        for variant in self._variants(term):
+            candidates.update(self._deletes.get(variant, ()))
+
+        matches = []
+        for word in candidates:
+            if abs(len(word) - len(term)) > self.max_edits:
+                continue
+            # Candidates can share a deletion while being more than max_edits apart
+            if weighted_edit_distance(term, word, max_cost=self.max_edits) is None:
+                continue
+            cost = weighted_edit_distance(term, word, self.substitution_costs, self.default_cost, max_cost)
+            if cost is not None:
+                matches.append((word, cost))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def best(self, term, max_cost=None):
+        """Returns the closest word to `term`, or None if nothing is within range."""
+        matches = self.lookup(term, max_cost)
+        return matches[0][0] if matches else None
+
+
+if __name__ == '__main__':
+    # Parity and timing check against a brute-force scan
+    import random
+    import string
+    import time
+    from src.config.config import AppConfig
+
+    costs, default = load_confusion_costs(AppConfig.LETTER_CONFUSIONS_PATH)
+    rng = random.Random(0)
+    vocabulary = {"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))) for _ in range(5000)}
+    index = FuzzyIndex(vocabulary, 2, costs, default)
+
+    queries = []
+    for word in rng.sample(sorted(vocabulary), 300):
+        letters = list(word)
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(letters))
+            operation = rng.choice(("substitute", "delete", "insert"))
+            if operation == "substitute":
+                letters[position] = rng.choice(string.ascii_lowercase)
+            elif operation == "delete" and len(letters) > 1:
+                del letters[position]
+            else:
+                letters.insert(position, rng.choice(string.ascii_lowercase))
+        queries.append("".join(letters))
+
+    start = time.perf_counter()
+    indexed = [index.lookup(q) for q in queries]
+    index_seconds = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    brute = []
+    for q in queries:
+        # Same contract as lookup(): within 2 plain edits, filtered by weighted cost
+        found = [(w, weighted_edit_distance(q, w, costs, default, 2)) for w in vocabulary
+                 if weighted_edit_distance(q, w, max_cost=2) is not None]
+        brute.append(sorted(((w, c) for w, c in found if c is not None), key=lambda m: (m[1], m[0])))
+    brute_seconds = (time.perf_counter() - start) / len(queries)
+
+    agree = sum(a == b for a, b in zip(indexed, brute))
+    print(f"{len(vocabulary)} words, {len(index._deletes)} deletion keys")
+    print(f"Index lookup: {index_seconds * 1e6:8.1f} us/query")
+    print(f"Brute force:  {brute_seconds * 1e6:8.1f} us/query")
+    print(f"Identical results: {agree}/{len(queries)}")
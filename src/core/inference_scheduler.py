@@ -0,0 +1,93 @@
+# inference_scheduler.py
+
+import time
+import numpy as np
+
+
+class AdaptiveInferenceScheduler:
+    """
+    Decides when the classifier is worth running.
+
+    Motion is the mean absolute displacement of the normalized landmarks
+    since the last prediction. A held pose (little motion) is only
+    re-classified every `hold_interval` seconds, a transition between letters
+    (large motion) is classified every `transition_interval` seconds, and
+    anything in between every `base_interval` seconds. A token bucket caps
+    the total number of inferences per second regardless of motion.
+    """
+    def __init__(self, still_threshold, transition_threshold, base_interval,
+                 transition_interval, hold_interval, max_per_second):
+        self.still_threshold = still_threshold
+        self.transition_threshold = transition_threshold
+        self.base_interval = base_interval
+        self.transition_interval = transition_interval
+        self.hold_interval = hold_interval
+        self.max_per_second = max_per_second
+
+        self.reference_landmarks = None # Landmarks at the last prediction
+        self.last_run = None
+        self.last_motion = 0.0
+        self._tokens = float(max_per_second)
+        self._last_refill = None
+
+        # Counters for tuning
+        self.runs = 0
+        self.skipped = 0
+        self.budget_limited = 0
+
+    def should_run(self, landmarks, now=None):
+        """Returns True if the classifier should run on these (21, 3) landmarks now."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+
+        if self.reference_landmarks is None or self.last_run is None:
+            interval = 0.0
+        else:
+            self.last_motion = float(np.mean(np.abs(landmarks - self.reference_landmarks)))
+            if self.last_motion >= self.transition_threshold:
+                interval = self.transition_interval
+            elif self.last_motion <= self.still_threshold:
+                interval = self.hold_interval
+            else:
+                interval = self.base_interval
+
+        if self.last_run is not None and now - self.last_run < interval:
+            self.skipped += 1
+            return False
+        if self._tokens < 1.0:
+            self.budget_limited += 1
+            return False
+        return True
+
+    def record_run(self, landmarks, now=None):
+        """Call after the classifier ran on `landmarks`; consumes one unit of the budget."""
+        now = time.monotonic() if now is None else now
+        if self.reference_landmarks is None:
+            self.reference_landmarks = np.array(landmarks, dtype=np.float32)
+        else:
+            self.reference_landmarks[:] = landmarks
+        self.last_run = now
+        self._tokens -= 1.0
+        self.runs += 1
+
+    def reset(self):
+        """Forgets the last prediction, e.g. when the camera restarts."""
+        self.reference_landmarks = None
+        self.last_run = None
+        self.last_motion = 0.0
+        self._tokens = float(self.max_per_second)
+        self._last_refill = None
+
+    def _refill(self, now):
+        if self._last_refill is not None:
+            elapsed = now - self._last_refill
+            self._tokens = min(float(self.max_per_second), self._tokens + elapsed * self.max_per_second)
+        self._last_refill = now
+
+    def stats(self):
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "budget_limited": self.budget_limited,
+            "last_motion": self.last_motion,
+        }
@@ -0,0 +1,89 @@
+# keyword_matcher.py
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    An Aho-Corasick automaton over a fixed set of keywords.
+
+    Keywords are compiled once with add() and build(); afterwards find_all()
+    reports every keyword occurring in a text in a single linear pass, and
+    best() picks one value deterministically: the longest matching keyword
+    wins, and ties go to the keyword that was added first.
+    """
+    def __init__(self):
+        self._goto = [{}] # node -> {char: node}
+        self._fail = [0]
+        self._outputs = [[]] # node -> [(keyword, priority, value)] ending here
+        self._count = 0
+        self._built = False
+
+    def __len__(self):
+        return self._count
+
+    def add(self, keyword, value):
+        """Adds a keyword that maps to `value`. Must be called before build()."""
+        if self._built:
+            raise RuntimeError("Cannot add keywords after the matcher has been built.")
+        if not keyword:
+            return
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((keyword, self._count, value))
+        self._count += 1
+
+    def build(self):
+        """Computes the failure links. Returns self for chaining."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # A node also reports every keyword that is a suffix of its own.
+                inherited = self._outputs[self._fail[child]]
+                if inherited:
+                    own = self._outputs[child]
+                    self._outputs[child] = own + inherited if own else inherited
+        self._built = True
+        return self
+
+    def find_all(self, text):
+        """Returns (start, end, keyword, value) for every keyword occurrence in `text`."""
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword, _, value in self._outputs[node]:
+                matches.append((index + 1 - len(keyword), index + 1, keyword, value))
+        return matches
+
+    def best(self, text):
+        """Returns the value of the longest matching keyword (earliest added on ties), or None."""
+        best_key = None
+        best_value = None
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword, priority, value in self._outputs[node]:
+                key = (-len(keyword), priority)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_value = value
+        return best_value
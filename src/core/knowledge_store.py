@@ -0,0 +1,247 @@
+# knowledge_store.py
+
+import json
+import os
+import threading
+import time
+from src.config.config import AppConfig
+from src.core.metrics import REGISTRY
+
+
+class KnowledgeSnapshot:
+    """
+    One consistent version of the knowledge files and every index built from
+    them. Snapshots are never modified after they are published; a query
+    reads store.snapshot once and uses that object throughout.
+    """
+    def __init__(self, version, sources, indexes, loaded_at):
+        self.version = version
+        self.sources = sources # source name -> parsed JSON
+        self.indexes = indexes # index name -> built index
+        self.loaded_at = loaded_at
+
+    @property
+    def knowledge_base(self):
+        return self.sources.get("knowledge_base", {})
+
+    @property
+    def nlp_config(self):
+        return self.sources.get("nlp_config", {})
+
+    @property
+    def letter_confusions(self):
+        return self.sources.get("letter_confusions", {})
+
+    @property
+    def mall_graph(self):
+        return self.sources.get("mall_graph", {})
+
+    def index(self, name):
+        return self.indexes[name]
+
+
+class KnowledgeStore:
+    """
+    Loads the knowledge JSON files once for every consumer and hot-reloads
+    them when they change on disk.
+
+    Consumers register an index builder (a function of the snapshot). When a
+    file's mtime or size changes, the watcher thread parses the files and
+    runs every builder off to the side, then publishes the new snapshot with
+    a single reference assignment. Queries in flight keep the snapshot they
+    started with, so they never see a half-built state. A reload that fails
+    (e.g. a file caught mid-write or mid-rename) keeps the previous snapshot.
+    """
+    def __init__(self, paths):
+        """
+        Args:
+            paths (dict): source name -> JSON file path.
+        """
+        self.paths = dict(paths)
+        self._snapshot = None
+        self._builders = {}
+        self._subscribers = []
+        self._signatures = {}
+        self._loaded_sources = set() # Sources read from disk for the current snapshot
+        self._lock = threading.Lock() # Serializes loads and builds; reads never take it
+        self._stop_event = threading.Event()
+        self._watcher = None
+        self.timings = {"load_seconds": 0.0, "index_seconds": {}}
+
+    @property
+    def snapshot(self):
+        """The current snapshot; loads the files on first use."""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._load_locked(strict=False)
+        return self._snapshot
+
+    def _file_signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_sources(self, strict):
+        """
+        Parses every source. Returns (sources, names read from disk). A file
+        that is missing or fails to parse becomes {}, unless `strict`. Strict
+        reloads still allow a file that was already missing for the current
+        snapshot, but one that disappeared since (e.g. caught between the
+        unlink and the rename of a save) fails the reload like a parse error.
+        """
+        sources = {}
+        loaded = set()
+        for name, path in self.paths.items():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    sources[name] = json.load(f)
+                loaded.add(name)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                if strict and (name in self._loaded_sources or not isinstance(e, FileNotFoundError)):
+                    raise
+                print(f"ERROR: Could not load or parse JSON from '{path}'. Details: {e}")
+                sources[name] = {}
+        return sources, loaded
+
+    def _build_indexes(self, snapshot, builders):
+        index_seconds = {}
+        for name, builder in builders.items():
+            start = time.perf_counter()
+            snapshot.indexes[name] = builder(snapshot)
+            index_seconds[name] = time.perf_counter() - start
+            if REGISTRY.enabled:
+                REGISTRY.histogram("knowledge_store_index_build_seconds",
+                                   "Time to build one index from the knowledge files.").observe(index_seconds[name])
+        return index_seconds
+
+    def _publish(self, snapshot):
+        self._snapshot = snapshot
+        for callback in list(self._subscribers):
+            callback(snapshot)
+
+    def load(self):
+        """Reads the files and rebuilds every registered index. Returns the new snapshot."""
+        with self._lock:
+            return self._load_locked(strict=False)
+
+    def _load_locked(self, strict):
+        start = time.perf_counter()
+        signatures = {name: self._file_signature(path) for name, path in self.paths.items()}
+        sources, loaded = self._read_sources(strict)
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        snapshot = KnowledgeSnapshot(version, sources, {}, time.time())
+        index_seconds = self._build_indexes(snapshot, self._builders)
+        load_seconds = time.perf_counter() - start
+
+        self._signatures = signatures
+        self._loaded_sources = loaded
+        self.timings = {"load_seconds": load_seconds, "index_seconds": index_seconds}
+        if REGISTRY.enabled:
+            REGISTRY.histogram("knowledge_store_load_seconds",
+                               "Time to parse the knowledge files and rebuild all indexes.").observe(load_seconds)
+        self._publish(snapshot)
+        print(self.format_timings(snapshot))
+        return snapshot
+
+    def register_index(self, name, builder):
+        """
+        Adds an index built by `builder(snapshot)` to the current and all future
+        snapshots. Registering a name again keeps the existing builder. If the
+        first build raises, the exception propagates and nothing is
+        registered, so a broken builder cannot fail every later reload.
+        """
+        self.snapshot # Make sure there is something to build on
+        with self._lock:
+            if name in self._builders:
+                return
+            current = self._snapshot
+            snapshot = KnowledgeSnapshot(current.version, current.sources, dict(current.indexes), current.loaded_at)
+            index_seconds = self._build_indexes(snapshot, {name: builder})
+            self._builders[name] = builder
+            self.timings["index_seconds"].update(index_seconds)
+            self._publish(snapshot)
+
+    def subscribe(self, callback):
+        """
+        Calls `callback(snapshot)` after every published snapshot. Callbacks
+        run on the thread that built it and must not call back into the store.
+        """
+        self._subscribers.append(callback)
+
+    def has_changed(self):
+        return any(self._file_signature(path) != self._signatures.get(name)
+                   for name, path in self.paths.items())
+
+    def reload_if_changed(self):
+        """Rebuilds if any file changed on disk. Returns True if a new snapshot was published."""
+        if not self.has_changed():
+            return False
+        with self._lock:
+            if not self.has_changed():
+                return False
+            try:
+                self._load_locked(strict=True)
+            except Exception as e:
+                # Don't retry until the files change again
+                self._signatures = {name: self._file_signature(path) for name, path in self.paths.items()}
+                print(f"ERROR: Knowledge reload failed, keeping version {self._snapshot.version}. Details: {e}")
+                return False
+        return True
+
+    def start_watching(self, interval):
+        """Polls the files every `interval` seconds on a daemon thread."""
+        if self._watcher is not None:
+            return
+        self._stop_event.clear()
+
+        def watch_loop():
+            while not self._stop_event.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch_loop, name="knowledge-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def format_timings(self, snapshot=None):
+        snapshot = snapshot or self._snapshot
+        indexes = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.timings["index_seconds"].items())
+        return (f"Knowledge store v{snapshot.version} loaded in {self.timings['load_seconds'] * 1000:.1f} ms"
+                + (f" (indexes: {indexes})" if indexes else ""))
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "load_seconds": self.timings["load_seconds"],
+            "index_seconds": dict(self.timings["index_seconds"]),
+        }
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_knowledge_store():
+    """Returns the process-wide store over the configured knowledge files, creating it on first use."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = KnowledgeStore({
+                "knowledge_base": AppConfig.KNOWLEDGE_BASE_PATH,
+                "nlp_config": AppConfig.NLP_CONFIG_PATH,
+                "letter_confusions": AppConfig.LETTER_CONFUSIONS_PATH,
+                "mall_graph": AppConfig.MALL_GRAPH_PATH,
+            })
+            _shared_store.snapshot # Load now rather than on the first query
+            if AppConfig.KNOWLEDGE_RELOAD_INTERVAL:
+                _shared_store.start_watching(AppConfig.KNOWLEDGE_RELOAD_INTERVAL)
+        return _shared_store
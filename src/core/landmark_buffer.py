@@ -0,0 +1,75 @@
+# landmark_buffer.py
+
+import numpy as np
+from src.core.landmark_normalization import NUM_COORDINATES, NUM_LANDMARKS, normalize_landmarks_in_place, write_normalized_landmarks
+
+
+class LandmarkRingBuffer:
+    """
+    A fixed-size ring buffer of normalized hand landmarks.
+
+    Storage is one preallocated (capacity, 21, 3) float32 array. Frames are
+    written straight into the next slot (see next_slot/commit), so nothing is
+    allocated or copied per frame. It is shared by the recognizer, the replay
+    tooling and the training notebook.
+    """
+    def __init__(self, capacity, num_landmarks=NUM_LANDMARKS, num_coordinates=NUM_COORDINATES):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, num_landmarks, num_coordinates), dtype=np.float32)
+        self.write_index = 0 # Slot the next frame is written to
+        self.valid_count = 0 # Number of slots holding real frames
+
+    def __len__(self):
+        return self.valid_count
+
+    def is_full(self):
+        return self.valid_count == self.capacity
+
+    def next_slot(self):
+        """Returns a writable view of the slot the next frame goes into. Call commit() once it is filled."""
+        return self.data[self.write_index]
+
+    def commit(self):
+        """Marks the slot returned by next_slot() as valid and advances the write index."""
+        self.write_index = (self.write_index + 1) % self.capacity
+        self.valid_count = min(self.valid_count + 1, self.capacity)
+
+    def push(self, landmarks):
+        """Copies an already normalized (21, 3) array into the buffer."""
+        self.data[self.write_index] = landmarks
+        self.commit()
+
+    def push_raw_landmarks(self, landmarks):
+        """Copies a raw (21, 3) landmark array into the next slot and normalizes it there."""
+        slot = self.next_slot()
+        slot[:] = landmarks
+        normalize_landmarks_in_place(slot)
+        self.commit()
+
+    def push_hand_landmarks(self, hand_landmarks):
+        """Extracts and normalizes MediaPipe landmarks straight into the next slot."""
+        write_normalized_landmarks(hand_landmarks, self.next_slot())
+        self.commit()
+
+    def last(self):
+        """Returns a view of the most recent frame, or None if the buffer is empty."""
+        if self.valid_count == 0:
+            return None
+        return self.data[self.write_index - 1]
+
+    def window(self, out=None):
+        """
+        Copies the valid frames, oldest first, into `out` (allocated if not
+        given) and returns the filled part of it.
+        """
+        if out is None:
+            out = np.empty((self.valid_count,) + self.data.shape[1:], dtype=self.data.dtype)
+        start = (self.write_index - self.valid_count) % self.capacity
+        first_part = min(self.valid_count, self.capacity - start)
+        out[:first_part] = self.data[start:start + first_part]
+        out[first_part:self.valid_count] = self.data[:self.valid_count - first_part]
+        return out[:self.valid_count]
+
+    def clear(self):
+        self.write_index = 0
+        self.valid_count = 0
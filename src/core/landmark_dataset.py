@@ -0,0 +1,185 @@
+# landmark_dataset.py
+"""
+Compact on-disk landmark datasets that load instantly via memory mapping.
+
+A dataset is a directory holding:
+    landmarks.npy  float32 (N, 21, 3)
+    labels.npy     int32 (N,), indexes into meta["classes"]
+    meta.json      {"format_version", "count", "classes", "normalized", "source"}
+
+meta.json is written last, so a directory without it is an unfinished
+conversion. Opening a dataset maps the arrays with np.load(mmap_mode='r');
+rows are only read from disk when they are used, so datasets larger than
+RAM can be trained on batch by batch.
+"""
+
+import csv
+import json
+import os
+import numpy as np
+from src.core.landmark_normalization import NUM_COORDINATES, NUM_FEATURES, NUM_LANDMARKS, normalize_landmarks_in_place
+
+FORMAT_VERSION = 1
+LANDMARKS_FILE = "landmarks.npy"
+LABELS_FILE = "labels.npy"
+META_FILE = "meta.json"
+
+
+def is_dataset(path):
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+class LandmarkDataset:
+    """A dataset directory opened read-only; the arrays are memory-mapped, not loaded."""
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"'{path}' has dataset format {self.meta.get('format_version')}, expected {FORMAT_VERSION}.")
+        self.path = path
+        self.classes = self.meta["classes"]
+        self.normalized = self.meta.get("normalized", False)
+        self.landmarks = np.load(os.path.join(path, LANDMARKS_FILE), mmap_mode='r')
+        self.labels = np.load(os.path.join(path, LABELS_FILE), mmap_mode='r')
+        if len(self.landmarks) != len(self.labels) or len(self.labels) != self.meta["count"]:
+            raise ValueError(f"'{path}' is inconsistent: {len(self.landmarks)} landmark rows, "
+                             f"{len(self.labels)} labels, {self.meta['count']} in {META_FILE}.")
+
+    def __len__(self):
+        return len(self.labels)
+
+    def label_names(self, labels=None):
+        """Maps label indexes (default: every row) to class names."""
+        labels = self.labels if labels is None else labels
+        return np.asarray(self.classes)[labels]
+
+    def class_counts(self):
+        return dict(zip(self.classes, np.bincount(self.labels, minlength=len(self.classes)).tolist()))
+
+    def read(self, indexes, normalize=True):
+        """Returns (landmarks, labels) for `indexes` as in-memory arrays."""
+        landmarks = np.array(self.landmarks[indexes], dtype=np.float32)
+        if normalize and not self.normalized:
+            normalize_landmarks_in_place(landmarks)
+        return landmarks, np.array(self.labels[indexes])
+
+    def iter_batches(self, batch_size=256, shuffle=False, seed=None, normalize=True):
+        """
+        Yields (landmarks (B, 21, 3), labels (B,)) batches, reading only one
+        batch from disk at a time. With `normalize`, raw landmarks are
+        normalized exactly as at runtime.
+        """
+        count = len(self)
+        if not shuffle:
+            for start in range(0, count, batch_size):
+                yield self.read(slice(start, start + batch_size), normalize)
+            return
+        order = np.random.default_rng(seed).permutation(count)
+        for start in range(0, count, batch_size):
+            # Sorted indexes read the mapped file front to back within a batch
+            yield self.read(np.sort(order[start:start + batch_size]), normalize)
+
+
+def open_dataset(path):
+    """Opens a dataset directory, or a landmark CSV via a dataset converted next to it on first use."""
+    if is_dataset(path):
+        return LandmarkDataset(path)
+    if not path.lower().endswith('.csv'):
+        raise ValueError(f"'{path}' is neither a dataset directory nor a landmark CSV.")
+    dataset_path = os.path.splitext(path)[0]
+    if is_dataset(dataset_path):
+        return LandmarkDataset(dataset_path)
+    print(f"Converting '{path}' into '{dataset_path}'...")
+    return convert_csv(path, dataset_path)
+
+
+def save_dataset(path, landmarks, labels, classes, normalized=False, source=None):
+    """Writes in-memory arrays as a dataset. `labels` are indexes into `classes`."""
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, NUM_COORDINATES)
+    labels = np.asarray(labels, dtype=np.int32)
+    os.makedirs(path, exist_ok=True)
+    _remove_meta(path)
+    np.save(os.path.join(path, LANDMARKS_FILE), landmarks)
+    np.save(os.path.join(path, LABELS_FILE), labels)
+    _write_meta(path, len(labels), list(classes), normalized, source)
+    return LandmarkDataset(path)
+
+
+def _remove_meta(path):
+    if os.path.exists(os.path.join(path, META_FILE)):
+        os.remove(os.path.join(path, META_FILE)) # The old arrays are about to be overwritten
+
+
+def _write_meta(path, count, classes, normalized, source):
+    meta = {"format_version": FORMAT_VERSION, "count": count, "classes": classes,
+            "normalized": normalized, "source": source}
+    with open(os.path.join(path, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+def _count_rows(csv_path):
+    with open(csv_path, 'r', newline='') as f:
+        next(f, None) # header
+        return sum(1 for line in f if line.strip())
+
+
+def convert_csv(csv_path, path, normalize=False, chunk_rows=65536):
+    """
+    Streams a landmark CSV (label, x0, y0, z0, ..., z20) into a dataset,
+    holding at most `chunk_rows` parsed rows in memory. Classes are sorted,
+    matching sklearn's LabelEncoder. With `normalize`, the stored landmarks
+    are already normalized, which saves that step on every epoch.
+    """
+    count = _count_rows(csv_path)
+    os.makedirs(path, exist_ok=True)
+    _remove_meta(path)
+    landmarks = np.lib.format.open_memmap(os.path.join(path, LANDMARKS_FILE), mode='w+', dtype=np.float32,
+                                          shape=(count, NUM_LANDMARKS, NUM_COORDINATES))
+    labels = np.lib.format.open_memmap(os.path.join(path, LABELS_FILE), mode='w+', dtype=np.int32, shape=(count,))
+
+    class_ids = {} # Label -> index in order of first appearance, remapped to sorted order at the end
+    written = 0
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        if len(header) != 1 + NUM_FEATURES:
+            raise ValueError(f"'{csv_path}' has {len(header)} columns, expected {1 + NUM_FEATURES}.")
+        chunk_labels, chunk_values = [], []
+        for line_number, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            if len(row) != 1 + NUM_FEATURES:
+                raise ValueError(f"'{csv_path}' line {line_number} has {len(row)} columns, expected {1 + NUM_FEATURES}.")
+            chunk_labels.append(class_ids.setdefault(row[0].upper(), len(class_ids)))
+            chunk_values.append(row[1:])
+            if len(chunk_values) == chunk_rows:
+                written = _write_chunk(landmarks, labels, written, chunk_values, chunk_labels, normalize)
+                chunk_labels, chunk_values = [], []
+        if chunk_values:
+            written = _write_chunk(landmarks, labels, written, chunk_values, chunk_labels, normalize)
+
+    if written != count:
+        raise ValueError(f"'{csv_path}' changed while it was being converted ({count} rows counted, {written} read).")
+
+    classes = sorted(class_ids)
+    remap = np.empty(len(class_ids), dtype=np.int32)
+    for name, first_seen in class_ids.items():
+        remap[first_seen] = classes.index(name)
+    for start in range(0, count, chunk_rows):
+        labels[start:start + chunk_rows] = remap[labels[start:start + chunk_rows]]
+    landmarks.flush()
+    labels.flush()
+    del landmarks, labels
+
+    _write_meta(path, count, classes, normalize, os.path.basename(csv_path))
+    return LandmarkDataset(path)
+
+
+def _write_chunk(landmarks, labels, start, values, chunk_labels, normalize):
+    end = start + len(values)
+    block = np.asarray(values, dtype=np.float32).reshape(-1, NUM_LANDMARKS, NUM_COORDINATES)
+    if normalize:
+        normalize_landmarks_in_place(block)
+    landmarks[start:end] = block
+    labels[start:end] = chunk_labels
+    return end
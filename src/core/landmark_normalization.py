@@ -0,0 +1,73 @@
+# landmark_normalization.py
+"""
+The one definition of how hand landmarks are normalized before they reach
+the model: wrist-relative, then scaled by the largest wrist-to-landmark
+distance. A hand whose landmarks all sit on the wrist (distance zero)
+becomes all zeros. The recognizer, the replay tooling and the training
+notebook all import it, so training and serving cannot drift apart.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_COORDINATES = 3
+NUM_FEATURES = NUM_LANDMARKS * NUM_COORDINATES # One flat CSV row
+
+
+def normalize_landmarks_in_place(out):
+    """
+    Normalizes a (..., 21, 3) float array in place, one vectorized pass for
+    any number of leading dimensions (a single hand or a whole dataset).
+    """
+    out -= out[..., :1, :].copy() # Wrist-relative
+    max_dist = np.sqrt(np.einsum('...ij,...ij->...i', out, out).max(axis=-1))
+    # Zero distance means every landmark is already 0 after the subtraction
+    out /= np.where(max_dist == 0, 1, max_dist)[..., np.newaxis, np.newaxis]
+    return out
+
+
+def normalize_landmarks(landmarks, dtype=np.float32):
+    """
+    Returns a normalized copy of raw landmarks, shaped (..., 21, 3). Flat
+    (..., 63) rows, as stored in the landmark CSVs, are reshaped first.
+    """
+    out = np.array(landmarks, dtype=dtype, copy=True)
+    if out.shape[-1] == NUM_FEATURES:
+        out = out.reshape(out.shape[:-1] + (NUM_LANDMARKS, NUM_COORDINATES))
+    return normalize_landmarks_in_place(out)
+
+
+def write_normalized_landmarks(hand_landmarks, out):
+    """Writes MediaPipe hand landmarks into a preallocated (21, 3) array and normalizes them in place."""
+    for i, lm in enumerate(hand_landmarks.landmark):
+        out[i] = (lm.x, lm.y, lm.z)
+    return normalize_landmarks_in_place(out)
+
+
+if __name__ == '__main__':
+    # Parity and timing check against the old one-row-at-a-time loop
+    import time
+
+    rng = np.random.default_rng(0)
+    raw = rng.normal(size=(200000, NUM_FEATURES)).astype(np.float32)
+    raw[:10] = 0.0 # Degenerate hands
+    raw[10:20] = np.tile(raw[10:20, :3], NUM_LANDMARKS) # Every landmark on the wrist
+
+    start = time.perf_counter()
+    looped = []
+    for row in raw:
+        relative = row.reshape(NUM_LANDMARKS, NUM_COORDINATES) - row[:3]
+        max_dist = np.max(np.linalg.norm(relative, axis=1))
+        looped.append(relative / (max_dist if max_dist != 0 else 1))
+    looped = np.array(looped)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = normalize_landmarks(raw)
+    vectorized_seconds = time.perf_counter() - start
+
+    print(f"{len(raw)} rows")
+    print(f"Row loop:   {loop_seconds:8.3f} s")
+    print(f"Vectorized: {vectorized_seconds:8.3f} s")
+    print(f"Max abs difference: {np.abs(looped - vectorized).max():.2e}")
+    print(f"Degenerate rows all zero: {not vectorized[:20].any()}")
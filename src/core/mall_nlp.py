@@ -1,116 +1,237 @@
 # mall_nlp.py (Upgraded)
 
-import json
 import random
 from src.config.config import AppConfig
+from src.core.fuzzy_index import FuzzyIndex, parse_confusion_costs
+from src.core.keyword_matcher import KeywordMatcher
+from src.core.knowledge_store import get_knowledge_store
+from src.core.metrics import timed
+from src.core.route_engine import RouteEngine
+
+class NLPIndexes:
+    """Everything MallNLP precomputes from one knowledge snapshot."""
+    def __init__(self, knowledge_base, nlp_config):
+        self.knowledge_base = knowledge_base
+        self.intents = nlp_config.get('intents', {})
+        self.fallback_response = nlp_config.get('fallback_response', "Maaf, saya tidak mengerti.")
+
+class Resolution:
+    """
+    What a sentence resolved to, before anything random is picked: the
+    candidate answers and the pool suggestions are drawn from. It is a pure
+    function of the sentence, the stand and the knowledge snapshot, so it
+    can be cached; render() makes the random choices per response.
+    """
+    def __init__(self, answers, suggestion_pool=(), exclude_key=None, suggestion_count=2):
+        self.answers = answers # Candidate answer strings, one picked per response
+        self.suggestion_pool = suggestion_pool # [(key, question)] of the found entity's category
+        self.exclude_key = exclude_key # The found entity, never suggested back
+        self.suggestion_count = suggestion_count
+
+    def render(self):
+        """Returns (answer_string, suggestions_list) with fresh random picks."""
+        answer = self.answers[0] if len(self.answers) == 1 else random.choice(self.answers)
+        pool = self.suggestion_pool
+        # Sampling one extra entry leaves enough after dropping the found entity.
+        picks = random.sample(pool, min(self.suggestion_count + 1, len(pool)))
+        suggestions = [question for key, question in picks if key != self.exclude_key][:self.suggestion_count]
+        return answer, suggestions
 
 class MallNLP:
     """
     An upgraded, more robust NLP engine that provides location-specific directions
     and suggests related locations.
+
+    The knowledge base and config come from the shared KnowledgeStore, so
+    edits to the files are picked up without a restart. Every MallNLP shares
+    the same indexes; one engine can answer for any number of kiosk stands
+    by passing stand_id per request.
     """
-    def __init__(self, stand_id="stand_pintu_timur"):
-        self.stand_id = stand_id
-        self.knowledge_base = self._load_json(AppConfig.KNOWLEDGE_BASE_PATH)
-        self.config = self._load_json(AppConfig.NLP_CONFIG_PATH)
-        
-        self.intents = self.config.get('intents', {})
-        self.fallback_response = self.config.get('fallback_response', "Maaf, saya tidak mengerti.")
+    def __init__(self, stand_id=None, store=None):
+        self.stand_id = stand_id or AppConfig.STAND_ID
+        self.store = store or get_knowledge_store()
+        self.store.register_index("mall_nlp", self.build_indexes)
         print(f"Upgraded NLP Engine initialized for stand: '{self.stand_id}'")
 
-    def _load_json(self, path):
-        """Helper function to load a JSON file with error handling."""
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"ERROR: Could not load or parse JSON from '{path}'. Details: {e}")
-            return {}
+    @classmethod
+    def build_indexes(cls, snapshot):
+        """Builds the NLPIndexes for a knowledge snapshot (run by the store on every reload)."""
+        indexes = NLPIndexes(snapshot.knowledge_base, snapshot.nlp_config)
+        indexes.entity_matcher, indexes.intent_matcher = cls.build_matchers(indexes.knowledge_base, indexes.intents)
+        indexes.category_index, indexes.entity_categories = cls.build_category_index(indexes.knowledge_base)
+        indexes.answer_table, indexes.fallback_answers = cls.build_answer_table(indexes.knowledge_base)
+        indexes.route_engine = RouteEngine(snapshot.mall_graph, indexes.knowledge_base)
+        indexes.stands = {stand_id for _, stand_id in indexes.answer_table} | set(indexes.route_engine.stands)
+        indexes.fuzzy_index = cls.build_fuzzy_index(indexes.knowledge_base, indexes.intents, snapshot.letter_confusions)
+        return indexes
 
-    def process_sentence(self, sentence):
+    def process_sentence(self, sentence, stand_id=None):
         """
         Legacy method for basic processing. Returns only the answer string.
         """
-        answer, _ = self.process_sentence_with_suggestions(sentence)
+        answer, _ = self.process_sentence_with_suggestions(sentence, stand_id)
         return answer
 
-    def process_sentence_with_suggestions(self, sentence):
+    def process_sentence_with_suggestions(self, sentence, stand_id=None):
         """
         Processes a sentence to find an answer and generate relevant suggestions.
+        Directions are given from `stand_id` (default: this engine's stand).
         
         Returns:
             tuple: (answer_string, suggestions_list)
         """
+        # One snapshot for the whole query, even if the files are reloaded meanwhile
+        indexes = self.store.snapshot.index("mall_nlp")
+        return self._resolve(indexes, sentence, stand_id or self.stand_id).render()
+
+    def process_batch(self, requests):
+        """
+        Answers many kiosk stands at once. `requests` is an iterable of
+        (stand_id, sentence) pairs; a stand_id of None means this engine's
+        stand. All of them are answered from the same knowledge snapshot.
+
+        Returns:
+            list: (answer_string, suggestions_list) per request, in order.
+        """
+        return [resolution.render() for resolution in self.resolve_batch(requests)]
+
+    @timed("mall_nlp_batch_seconds", "Resolving one batch of (stand, sentence) requests.")
+    def resolve_batch(self, requests):
+        """
+        Like process_batch, but returns the Resolution of each request so the
+        caller can cache it and render() it again for later responses.
+        """
+        indexes = self.store.snapshot.index("mall_nlp")
+        return [self._resolve(indexes, sentence, stand_id or self.stand_id) for stand_id, sentence in requests]
+
+    def known_stands(self):
+        """The stand ids that have hand-written directions or a place on the mall graph."""
+        return sorted(self.store.snapshot.index("mall_nlp").stands)
+
+    @timed("mall_nlp_process_seconds", "Intent/entity matching and answer selection for one sentence.")
+    def _resolve(self, indexes, sentence, stand_id):
         sentence = sentence.lower().strip()
         if not sentence:
-            return "Maaf, saya tidak mengerti. Silakan coba lagi.", []
+            return Resolution(("Maaf, saya tidak mengerti. Silakan coba lagi.",))
 
         # Upgraded Entity & Intent Matching
-        found_entity_key = self._find_entity(sentence)
-        found_intent_key = self._find_intent(sentence)
-
-        # Decision Logic
-        if found_intent_key == 'find_location' and found_entity_key:
-            answer = self._handle_find_location(found_entity_key)
-            suggestions = self._get_suggestions(found_entity_key)
-            return answer, suggestions
-        
-        elif found_entity_key:
-            answer = self._handle_find_location(found_entity_key)
-            suggestions = self._get_suggestions(found_entity_key)
-            return answer, suggestions
+        found_entity_key = self._find_entity(indexes, sentence)
+        found_intent_key = self._find_intent(indexes, sentence)
+        if found_entity_key is None or found_intent_key is None:
+            # Retry with misrecognized words snapped to the nearest known word
+            resolved = self._resolve_noisy_words(indexes, sentence)
+            if resolved != sentence:
+                found_entity_key = found_entity_key or self._find_entity(indexes, resolved)
+                found_intent_key = found_intent_key or self._find_intent(indexes, resolved)
+
+        # Decision Logic: a found location is answered whatever the intent was
+        if found_entity_key:
+            answer = self._handle_find_location(indexes, found_entity_key, stand_id)
+            return Resolution((answer,), self._suggestion_pool(indexes, found_entity_key), found_entity_key)
 
         elif found_intent_key:
-            responses = self.intents[found_intent_key].get('responses', [])
-            answer = random.choice(responses) if responses else self.fallback_response
-            return answer, []
+            responses = indexes.intents[found_intent_key].get('responses', [])
+            return Resolution(tuple(responses) or (indexes.fallback_response,))
         
         # If nothing is found
-        return self.fallback_response.format(sentence=sentence), []
+        return Resolution((indexes.fallback_response.format(sentence=sentence),))
 
-    def _find_entity(self, sentence):
-        """Finds the most relevant entity by matching keywords."""
-        for key, data in self.knowledge_base.items():
+    @staticmethod
+    def build_matchers(knowledge_base, intents):
+        """
+        Compiles the knowledge-base and intent keywords into keyword automata,
+        so matching a sentence is one pass regardless of how many entries exist.
+        """
+        entity_matcher = KeywordMatcher()
+        for key, data in knowledge_base.items():
             # The entity's own key and its keywords are all searchable terms
-            search_terms = data.get('keywords', []) + [key.replace('_', ' ')]
-            if any(term in sentence for term in search_terms):
-                return key
-        return None
-        
-    def _find_intent(self, sentence):
-        """Finds the first matching intent from the sentence."""
-        for intent_name, intent_data in self.intents.items():
-            if any(keyword in sentence for keyword in intent_data.get('keywords', [])):
-                return intent_name
-        return None
-
-    def _handle_find_location(self, entity_key):
-        """Generates a response for a found location."""
-        location_info = self.knowledge_base.get(entity_key, {})
+            for term in data.get('keywords', []) + [key.replace('_', ' ')]:
+                entity_matcher.add(term.lower(), key)
+
+        intent_matcher = KeywordMatcher()
+        for intent_name, intent_data in intents.items():
+            for keyword in intent_data.get('keywords', []):
+                intent_matcher.add(keyword.lower(), intent_name)
+        return entity_matcher.build(), intent_matcher.build()
+
+    @staticmethod
+    def build_category_index(knowledge_base):
+        """
+        Groups the entries by 'kategori', with their suggestion questions
+        already formatted. Returns (category -> [(key, question)], key -> category).
+        """
+        category_index = {}
+        entity_categories = {}
+        for key, data in knowledge_base.items():
+            category = data.get('kategori')
+            if not category:
+                continue
+            display_name = data.get('nama_display', key.replace('_', ' ').title())
+            category_index.setdefault(category, []).append((key, f"Di mana lokasi {display_name}?"))
+            entity_categories[key] = category
+        return category_index, entity_categories
+
+    @staticmethod
+    def build_answer_table(knowledge_base):
+        """
+        Precomputes every location answer. Returns ((key, stand_id) -> directions,
+        key -> generic fallback answer).
+        """
+        answer_table = {}
+        fallback_answers = {}
+        for key, data in knowledge_base.items():
+            for stand_id, directions in data.get('directions', {}).items():
+                if directions:
+                    answer_table[(key, stand_id)] = directions
+
+            # Fallback to generic location and description
+            nama = data.get('nama_display', key.replace('_', ' ').title())
+            lokasi = data.get('lokasi', 'lokasi tidak diketahui')
+            deskripsi = data.get('deskripsi', '')
+            fallback_answers[key] = f"{nama} berada di {lokasi}, {deskripsi}."
+        return answer_table, fallback_answers
+
+    @staticmethod
+    def build_fuzzy_index(knowledge_base, intents, letter_confusions):
+        """Indexes every single word used by an entity or intent keyword, for fuzzy resolution."""
+        words = set()
+        for key, data in knowledge_base.items():
+            for term in data.get('keywords', []) + [key.replace('_', ' ')]:
+                words.update(term.lower().split())
+        for intent_data in intents.values():
+            for keyword in intent_data.get('keywords', []):
+                words.update(keyword.lower().split())
+        substitution_costs, default_cost = parse_confusion_costs(letter_confusions)
+        return FuzzyIndex(words, AppConfig.FUZZY_MAX_EDITS, substitution_costs, default_cost)
+
+    def _resolve_noisy_words(self, indexes, sentence):
+        """Replaces each unknown word of a sentence with its closest known word, if any."""
+        words = []
+        for word in sentence.split():
+            if len(word) >= AppConfig.FUZZY_MIN_WORD_LENGTH and word not in indexes.fuzzy_index.words:
+                word = indexes.fuzzy_index.best(word) or word
+            words.append(word)
+        return " ".join(words)
+
+    def _find_entity(self, indexes, sentence):
+        """Finds the most specific entity: the one with the longest keyword in the sentence."""
+        return indexes.entity_matcher.best(sentence)
         
-        # Prioritize directions specific to the current stand
-        directions = location_info.get('directions', {}).get(self.stand_id)
+    def _find_intent(self, indexes, sentence):
+        """Finds the intent with the longest keyword in the sentence."""
+        return indexes.intent_matcher.best(sentence)
+
+    def _handle_find_location(self, indexes, entity_key, stand_id):
+        """Looks up the precomputed answer for a found location."""
+        # Prioritize hand-written directions for the asking stand, then a computed route
+        directions = indexes.answer_table.get((entity_key, stand_id))
         if directions:
             return directions
-        
-        # Fallback to generic location and description
-        nama = location_info.get('nama_display', entity_key.replace('_', ' ').title())
-        lokasi = location_info.get('lokasi', 'lokasi tidak diketahui')
-        deskripsi = location_info.get('deskripsi', '')
-        return f"{nama} berada di {lokasi}, {deskripsi}."
-
-    def _get_suggestions(self, found_entity_key, count=2):
-        """Generates a list of suggested questions based on category."""
-        found_entity_data = self.knowledge_base.get(found_entity_key, {})
-        category = found_entity_data.get('kategori')
-        if not category:
-            return []
-
-        suggestions = []
-        for key, data in self.knowledge_base.items():
-            if key != found_entity_key and data.get('kategori') == category:
-                display_name = data.get('nama_display', key.replace('_', ' ').title())
-                suggestions.append(f"Di mana lokasi {display_name}?")
-        
-        random.shuffle(suggestions)
-        return suggestions[:count]
\ No newline at end of file
+        directions = indexes.route_engine.directions(entity_key, stand_id)
+        if directions:
+            return directions
+        return indexes.fallback_answers[entity_key]
+
+    def _suggestion_pool(self, indexes, found_entity_key):
+        """The entries of the found entity's category, to pick suggested questions from."""
+        return indexes.category_index.get(indexes.entity_categories.get(found_entity_key), [])
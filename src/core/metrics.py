@@ -0,0 +1,146 @@
+# metrics.py
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.config.config import AppConfig
+
+# Upper bounds in seconds; covers microsecond-scale inference up to slow NLP calls.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """A fixed-bucket latency histogram in the Prometheus style."""
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def to_prometheus(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {count}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """Holds the histograms and exports them as Prometheus text."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(name, help_text, buckets)
+            return self.histograms[name]
+
+    def render(self):
+        """Returns all histograms in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = list(self.histograms.values())
+        return "\n".join(h.to_prometheus() for h in histograms) + "\n"
+
+    def write_to_file(self, path):
+        """Writes the current metrics atomically, e.g. for a node_exporter textfile collector."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def start_file_exporter(self, path, interval=15.0):
+        """Rewrites `path` every `interval` seconds on a daemon thread."""
+        def export_loop():
+            while True:
+                try:
+                    self.write_to_file(path)
+                except OSError as e:
+                    print(f"ERROR: Could not write metrics to '{path}'. Details: {e}")
+                time.sleep(interval)
+        thread = threading.Thread(target=export_loop, name="metrics-file-exporter", daemon=True)
+        thread.start()
+        return thread
+
+    def start_http_exporter(self, port, host="127.0.0.1"):
+        """Serves GET /metrics on a loopback address from a daemon thread. Returns the server."""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep scrapes out of the console
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http-exporter", daemon=True).start()
+        return server
+
+
+REGISTRY = MetricsRegistry(enabled=AppConfig.METRICS_ENABLED)
+
+
+def timed(name, help_text=""):
+    """
+    Decorator that records the call duration in the `name` histogram.
+
+    Whether metrics are enabled is decided when the function is decorated
+    (at import), so with metrics disabled the original function is returned
+    untouched and the probe costs nothing.
+    """
+    def decorator(func):
+        if not REGISTRY.enabled:
+            return func
+        histogram = REGISTRY.histogram(name, help_text)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def start_exporters_from_config():
+    """Starts the exporters configured in AppConfig, if metrics are enabled."""
+    if not REGISTRY.enabled:
+        return
+    if AppConfig.METRICS_EXPORT_PATH:
+        REGISTRY.start_file_exporter(AppConfig.METRICS_EXPORT_PATH, AppConfig.METRICS_EXPORT_INTERVAL)
+        print(f"Writing metrics to '{AppConfig.METRICS_EXPORT_PATH}'.")
+    if AppConfig.METRICS_HTTP_PORT:
+        REGISTRY.start_http_exporter(AppConfig.METRICS_HTTP_PORT)
+        print(f"Serving metrics on http://127.0.0.1:{AppConfig.METRICS_HTTP_PORT}/metrics")
@@ -0,0 +1,146 @@
+# neighbor_classifiers.py
+
+import numpy as np
+from src.core.landmark_normalization import NUM_FEATURES
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError: # SciPy is optional; the brute-force search gives the same neighbours
+    cKDTree = None
+
+
+def training_arrays(dataset, class_names):
+    """
+    Reads a LandmarkDataset for the classifiers below. Returns (normalized
+    landmarks as (N, 63) float32, labels as indexes into class_names).
+    """
+    missing = [name for name in dataset.classes if name not in class_names]
+    if missing:
+        raise ValueError(f"Dataset classes {missing} are not in the model's labels.")
+    landmarks, labels = dataset.read(slice(None))
+    remap = np.array([class_names.index(name) for name in dataset.classes])
+    return landmarks.reshape(len(landmarks), NUM_FEATURES), remap[labels]
+
+
+class NearestNeighborClassifier:
+    """
+    k-nearest-neighbour vote over normalized landmark vectors.
+
+    The probability of a class is its share of the k nearest training
+    samples, so CONFIDENCE_THRESHOLD reads as "at least this fraction of the
+    neighbours agree". Neighbours come from a KD-tree when SciPy is
+    installed, otherwise from one brute-force distance matrix per batch.
+    """
+    def __init__(self, landmarks, labels, num_classes, k=5, use_tree=True):
+        self.landmarks = np.ascontiguousarray(landmarks, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        self.labels = np.asarray(labels)
+        self.num_classes = num_classes
+        self.k = min(k, len(self.landmarks))
+        self.tree = cKDTree(self.landmarks) if use_tree and cKDTree is not None else None
+        self._squared_norms = np.einsum('ij,ij->i', self.landmarks, self.landmarks)
+
+    def _neighbors(self, x):
+        if self.tree is not None:
+            _, indexes = self.tree.query(x, k=self.k)
+            return indexes.reshape(len(x), self.k)
+        # |a - b|^2 = |a|^2 - 2 a.b + |b|^2; |a|^2 is the same for every b, so it is left out
+        distances = self._squared_norms - 2.0 * (x @ self.landmarks.T)
+        if self.k == len(self.landmarks):
+            return np.argsort(distances, axis=1)
+        return np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+
+    def predict(self, input_data, verbose=0):
+        """
+        Mirrors keras.Model.predict for a batch of (21, 3) landmark arrays.
+        Returns an (N, num_classes) array of probabilities.
+        """
+        x = np.asarray(input_data, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        neighbor_labels = self.labels[self._neighbors(x)]
+        probabilities = np.zeros((len(x), self.num_classes), dtype=np.float32)
+        np.add.at(probabilities, (np.arange(len(x))[:, np.newaxis], neighbor_labels), 1.0 / self.k)
+        return probabilities
+
+
+class NearestCentroidClassifier:
+    """
+    One mean landmark vector per class, with probabilities from a softmax
+    over the negative squared distances to the centroids.
+
+    Raw Gaussian likelihoods saturate the softmax: neighbouring centroids
+    are many variances apart, so even misclassified samples scored ~0.999.
+    Both knobs of the softmax are therefore fitted on out-of-fold distances
+    (every training sample scored by centroids built without it, over
+    calibration_folds folds) before the centroids are built from all data:
+
+    - a temperature, minimizing the negative log-likelihood of the true
+      labels, so a confidence of p is right about p of the time;
+    - an outlier distance, the own-centroid distance at outlier_quantile.
+      It acts as an extra "no sign" class that takes the probability mass
+      of hands farther from every centroid than nearly all real samples,
+      so they fall below CONFIDENCE_THRESHOLD.
+    """
+    def __init__(self, landmarks, labels, num_classes, calibration_folds=5, outlier_quantile=0.95, seed=0):
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        labels = np.asarray(labels)
+        self.num_classes = num_classes
+        self.temperature = 1.0
+        self.outlier_distance = None # Squared distance; None disables the outlier class
+        self._fit(landmarks, labels)
+        if calibration_folds > 1 and len(labels) >= calibration_folds:
+            self._calibrate(landmarks, labels, calibration_folds, outlier_quantile, seed)
+
+    def _fit(self, landmarks, labels):
+        self.present = np.unique(labels) # Classes without training samples are never predicted
+        self.centroids = np.stack([landmarks[labels == label].mean(axis=0) for label in self.present])
+        # Shared per-dimension variance of the samples around their own centroid
+        residuals = landmarks - self.centroids[np.searchsorted(self.present, labels)]
+        self.variance = max(float(np.mean(residuals ** 2)), 1e-12)
+        self._centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+
+    def _calibrate(self, landmarks, labels, folds, outlier_quantile, seed):
+        # Out-of-fold squared distances in units of each fold's variance, one
+        # column per class of the full model; a class missing from a fold's
+        # training part is infinitely far away
+        present = self.present
+        scaled = np.full((len(labels), len(present)), np.inf)
+        for held_out in np.array_split(np.random.default_rng(seed).permutation(len(labels)), folds):
+            fit = np.setdiff1d(np.arange(len(labels)), held_out)
+            fold = NearestCentroidClassifier(landmarks[fit], labels[fit], self.num_classes, calibration_folds=0)
+            columns = np.searchsorted(present, fold.present)
+            scaled[held_out[:, np.newaxis], columns] = fold._squared_distances(landmarks[held_out]) / fold.variance
+        targets = np.searchsorted(present, labels)
+        own = scaled[np.arange(len(targets)), targets]
+        scored = np.isfinite(own) # Samples whose class was absent from their fold's training part
+        scaled, targets, own = scaled[scored], targets[scored], own[scored]
+        if not len(targets):
+            return
+
+        best_nll = np.inf
+        for temperature in np.geomspace(0.1, 1000.0, 161):
+            logits = -scaled / (2.0 * temperature)
+            logits -= logits.max(axis=1, keepdims=True)
+            nll = np.mean(np.log(np.exp(logits).sum(axis=1)) - logits[np.arange(len(targets)), targets])
+            if nll < best_nll:
+                best_nll, self.temperature = nll, float(temperature)
+        self.outlier_distance = float(np.quantile(own, outlier_quantile)) * self.variance
+
+    def _squared_distances(self, x):
+        return np.einsum('ij,ij->i', x, x)[:, np.newaxis] - 2.0 * (x @ self.centroids.T) + self._centroid_norms
+
+    def predict(self, input_data, verbose=0):
+        """
+        Mirrors keras.Model.predict for a batch of (21, 3) landmark arrays.
+        Returns an (N, num_classes) array of probabilities. With an outlier
+        distance the rows sum to less than 1; the rest is the outlier class.
+        """
+        x = np.asarray(input_data, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        squared_distances = self._squared_distances(x)
+        if self.outlier_distance is not None:
+            squared_distances = np.hstack([squared_distances, np.full((len(x), 1), self.outlier_distance)])
+        logits = -squared_distances / (2.0 * self.variance * self.temperature)
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        probabilities = np.zeros((len(x), self.num_classes), dtype=np.float32)
+        probabilities[:, self.present] = logits[:, :len(self.present)]
+        return probabilities
@@ -0,0 +1,150 @@
+# numpy_classifier.py
+
+import json
+import h5py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x = x - np.max(x, axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= np.sum(x, axis=-1, keepdims=True)
+    return x
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': _relu,
+    'softmax': _softmax,
+}
+
+
+class NumpyClassifier:
+    """
+    Runs the forward pass of the Sequential SIBI model in plain NumPy.
+
+    The weights and layer configuration are read once from the Keras .h5 file
+    with h5py, so TensorFlow is never imported. Only the layers used by the
+    training notebook are supported (Conv1D, MaxPooling1D, Flatten, Dense and
+    Dropout, which is a no-op at inference time).
+    """
+    def __init__(self, model_path):
+        self.layers = []
+        with h5py.File(model_path, 'r') as f:
+            model_config = json.loads(f.attrs['model_config'])
+            weights_group = f['model_weights']
+            for layer in model_config['config']['layers']:
+                step = self._build_layer(layer['class_name'], layer['config'], weights_group)
+                if step is not None:
+                    self.layers.append(step)
+
+    def _build_layer(self, class_name, config, weights_group):
+        """Turns one layer config into a (function, params) step, or None if it is a no-op."""
+        if class_name in ('InputLayer', 'Dropout'):
+            return None
+        if class_name == 'Flatten':
+            return (self._flatten, {})
+        if class_name == 'MaxPooling1D':
+            if config.get('padding', 'valid') != 'valid':
+                raise ValueError(f"Unsupported padding for MaxPooling1D: {config['padding']}")
+            pool_size = config['pool_size'][0]
+            strides = (config.get('strides') or [pool_size])[0]
+            return (self._max_pool1d, {'pool_size': pool_size, 'strides': strides})
+
+        activation = config.get('activation', 'linear')
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation '{activation}' in layer '{config['name']}'")
+        kernel, bias = self._load_weights(weights_group, config['name'], config.get('use_bias', True))
+
+        if class_name == 'Dense':
+            return (self._dense, {'kernel': kernel, 'bias': bias, 'activation': ACTIVATIONS[activation]})
+        if class_name == 'Conv1D':
+            if config.get('padding', 'valid') != 'valid' or config.get('dilation_rate', [1])[0] != 1:
+                raise ValueError(f"Only 'valid', undilated Conv1D is supported (layer '{config['name']}').")
+            # Reorder the (K, C, F) kernel to match the (C, K) window layout so a
+            # convolution becomes one matmul over flattened windows.
+            return (self._conv1d, {
+                'kernel': np.ascontiguousarray(kernel.transpose(1, 0, 2).reshape(-1, kernel.shape[2])),
+                'kernel_size': kernel.shape[0],
+                'bias': bias,
+                'strides': config.get('strides', [1])[0],
+                'activation': ACTIVATIONS[activation],
+            })
+        raise ValueError(f"Unsupported layer type: {class_name}")
+
+    def _load_weights(self, weights_group, layer_name, use_bias):
+        """Reads the kernel (and bias) of a layer, following the order stored in the file."""
+        group = weights_group[layer_name]
+        names = [n.decode() if isinstance(n, bytes) else n for n in group.attrs['weight_names']]
+        arrays = [np.asarray(group[name], dtype=np.float32) for name in names]
+        kernel = arrays[0]
+        bias = arrays[1] if use_bias and len(arrays) > 1 else np.zeros(kernel.shape[-1], dtype=np.float32)
+        return kernel, bias
+
+    @staticmethod
+    def _conv1d(x, kernel, kernel_size, bias, strides, activation):
+        # (N, L, C) -> (N, L_out, C, K) windows -> (N, L_out, C*K) @ (C*K, F)
+        windows = sliding_window_view(x, kernel_size, axis=1)[:, ::strides]
+        out = windows.reshape(windows.shape[0], windows.shape[1], -1) @ kernel
+        out += bias
+        return activation(out)
+
+    @staticmethod
+    def _max_pool1d(x, pool_size, strides):
+        if pool_size == strides:
+            steps = x.shape[1] // pool_size
+            return x[:, :steps * pool_size].reshape(x.shape[0], steps, pool_size, x.shape[2]).max(axis=2)
+        windows = sliding_window_view(x, pool_size, axis=1)[:, ::strides]
+        return windows.max(axis=-1)
+
+    @staticmethod
+    def _flatten(x):
+        return x.reshape(x.shape[0], -1)
+
+    @staticmethod
+    def _dense(x, kernel, bias, activation):
+        out = x @ kernel
+        out += bias
+        return activation(out)
+
+    def predict(self, input_data, verbose=0):
+        """
+        Mirrors keras.Model.predict for a batch of (21, 3) landmark arrays.
+        Returns an (N, num_classes) array of probabilities.
+        """
+        x = np.asarray(input_data, dtype=np.float32)
+        for fn, params in self.layers:
+            x = fn(x, **params)
+        return x
+
+
+if __name__ == '__main__':
+    # Parity check against Keras: python -m src.core.numpy_classifier
+    import time
+    from src.config.config import AppConfig
+    from tensorflow.keras.models import load_model
+
+    numpy_model = NumpyClassifier(AppConfig.MODEL_PATH)
+    keras_model = load_model(AppConfig.MODEL_PATH)
+
+    rng = np.random.default_rng(42)
+    samples = rng.uniform(-1.0, 1.0, size=(256, 21, 3)).astype(np.float32)
+
+    expected = keras_model.predict(samples, verbose=0)
+    actual = numpy_model.predict(samples)
+    max_error = np.max(np.abs(expected - actual))
+    same_argmax = np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))
+    print(f"Max abs difference: {max_error:.2e}, argmax agreement: {same_argmax * 100:.1f}%")
+    assert max_error < 1e-4, "NumPy backend diverges from Keras."
+
+    single = samples[:1]
+    for name, model in (("keras", keras_model), ("numpy", numpy_model)):
+        start = time.perf_counter()
+        for _ in range(200):
+            model.predict(single, verbose=0)
+        print(f"{name}: {(time.perf_counter() - start) / 200 * 1e6:.1f} us per single-sample call")
@@ -0,0 +1,80 @@
+# prefix_index.py
+
+import heapq
+from bisect import bisect_left
+
+
+def split_words(text):
+    return text.lower().split()
+
+
+def apply_completion(current_text, phrase):
+    """
+    Replaces the words being typed at the end of `current_text` with `phrase`.
+
+    As many trailing words are replaced as `phrase` completes, so picking
+    "food court" for "di mana food c" gives "di mana food court ".
+    """
+    words = current_text.split()
+    phrase_words = phrase.split()
+    for tail_length in range(min(len(words), len(phrase_words)), 0, -1):
+        tail = " ".join(words[-tail_length:]).lower()
+        if phrase.lower().startswith(tail):
+            return " ".join(words[:-tail_length] + [phrase]) + " "
+    return " ".join(words + [phrase]) + " "
+
+
+class PrefixIndex:
+    """
+    Top-k autocomplete over a weighted vocabulary of words and phrases.
+
+    The phrases are kept in one sorted array, so all completions of a prefix
+    form a contiguous range found with two bisections; the best `limit` of
+    that range are picked by weight. Multi-word phrases are matched against
+    the last few typed words as well as the last one, so "food c" completes
+    to "food court".
+    """
+    def __init__(self, weights):
+        """
+        Args:
+            weights (dict): phrase -> ranking weight (higher comes first).
+        """
+        entries = sorted((phrase.lower(), weight) for phrase, weight in weights.items() if phrase.strip())
+        self._keys = [key for key, _ in entries]
+        self._weights = [weight for _, weight in entries]
+        self.max_words = max((len(key.split()) for key in self._keys), default=1)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _range(self, prefix):
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\uffff", lo=start)
+        return start, end
+
+    def complete(self, prefix, limit=10):
+        """Returns up to `limit` phrases starting with `prefix`, highest weight first."""
+        start, end = self._range(prefix.lower())
+        indices = heapq.nsmallest(limit, range(start, end), key=lambda i: (-self._weights[i], self._keys[i]))
+        return [self._keys[i] for i in indices]
+
+    def suggest(self, current_text, limit=10):
+        """
+        Returns completions for the words being typed at the end of
+        `current_text`. Matches that use more of the typed words come first.
+        """
+        words = split_words(current_text)
+        if not words or current_text.endswith((' ', '\n')):
+            return []
+
+        suggestions = []
+        seen = set()
+        for tail_length in range(min(len(words), self.max_words), 0, -1):
+            tail = " ".join(words[-tail_length:])
+            for phrase in self.complete(tail, limit):
+                if phrase not in seen:
+                    seen.add(phrase)
+                    suggestions.append(phrase)
+            if len(suggestions) >= limit:
+                break
+        return suggestions[:limit]
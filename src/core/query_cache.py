@@ -0,0 +1,74 @@
+# query_cache.py
+
+import threading
+from collections import OrderedDict
+
+
+def normalize_query(text):
+    """The cache key form of a raw sentence: lower-case, single-spaced, trimmed."""
+    return " ".join(text.lower().split())
+
+
+class QueryCache:
+    """
+    A bounded LRU map from (normalized raw text, stand) to a finished query:
+    the corrected text and the NLP Resolution. Most kiosk traffic is the same
+    few questions, so a hit skips both correction and matching.
+
+    clear() bumps a generation number. A put() carrying the generation seen
+    before the work started is dropped if a clear happened meanwhile, so a
+    result computed from an old knowledge snapshot never outlives a reload.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached value, or None. Counts a hit or a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, *_):
+        """Drops every entry. Accepts and ignores a snapshot, so it can be a store subscriber."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,82 @@
+# query_pipeline.py
+
+from src.config.config import AppConfig
+from src.core.mall_nlp import MallNLP
+from src.core.metrics import timed
+from src.core.query_cache import QueryCache, normalize_query
+
+
+class QueryPipeline:
+    """
+    Auto-correction followed by the NLP engine, without any Qt. Used by the
+    desktop ResponseService and by the headless query server, so both answer
+    a sentence exactly the same way.
+
+    Finished queries are kept in an LRU cache keyed by (normalized raw text,
+    stand). The cache holds the corrected text and the NLP Resolution, not a
+    rendered response, so the answer and suggestions are still picked at
+    random per response. It is emptied whenever the knowledge store publishes
+    a new snapshot.
+    """
+    def __init__(self, text_processor=None, nlp_engine=None, cache_size=None):
+        self.text_processor = text_processor # Without one, text is only lower-cased
+        self.nlp_engine = nlp_engine or MallNLP()
+        cache_size = AppConfig.QUERY_CACHE_SIZE if cache_size is None else cache_size
+        self.cache = QueryCache(cache_size) if cache_size > 0 else None
+        if self.cache is not None:
+            self.nlp_engine.store.subscribe(self.cache.clear)
+
+    def set_text_processor(self, text_processor):
+        self.text_processor = text_processor
+        if self.cache is not None:
+            self.cache.clear() # Cached questions were corrected differently (or not at all)
+
+    def correct(self, text):
+        if self.text_processor is None:
+            return text.lower()
+        return self.text_processor.correct_sentence(text)
+
+    def process(self, text, stand_id=None):
+        """
+        Corrects and answers one sentence.
+
+        Returns:
+            dict: {"question", "answer", "suggestions"}
+        """
+        return self.process_batch([(stand_id, text)])[0]
+
+    @timed("query_pipeline_batch_seconds", "Cache lookup, correction, NLP and rendering of one batch, hits included.")
+    def process_batch(self, requests):
+        """
+        Answers (stand_id, text) pairs in order. Cache misses are corrected and
+        then resolved together against a single knowledge snapshot.
+        """
+        results = [None] * len(requests) # (question, resolution) per request
+        misses = []
+        for position, (stand_id, text) in enumerate(requests):
+            key = (normalize_query(text), stand_id or self.nlp_engine.stand_id)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                results[position] = cached
+            else:
+                misses.append((position, key, stand_id, text))
+
+        if misses:
+            generation = self.cache.generation if self.cache is not None else None
+            questions = [self.correct(text) for _, _, _, text in misses]
+            resolutions = self.nlp_engine.resolve_batch(
+                [(stand_id, question) for (_, _, stand_id, _), question in zip(misses, questions)])
+            for (position, key, _, _), question, resolution in zip(misses, questions, resolutions):
+                results[position] = (question, resolution)
+                if self.cache is not None:
+                    self.cache.put(key, results[position], generation)
+
+        responses = []
+        for question, resolution in results:
+            answer, suggestions = resolution.render()
+            responses.append({"question": question, "answer": answer, "suggestions": suggestions})
+        return responses
+
+    def cache_stats(self):
+        """Hit/miss counters of the query cache, or None when caching is off."""
+        return self.cache.stats() if self.cache is not None else None
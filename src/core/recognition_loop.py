@@ -0,0 +1,113 @@
+# recognition_loop.py
+
+import time
+from src.config.config import AppConfig
+from src.core.inference_scheduler import AdaptiveInferenceScheduler
+
+
+class RecognitionLoop:
+    """
+    The per-frame prediction cadence and letter stability logic.
+
+    It is shared by CameraService (live webcam) and the replay benchmark, so
+    both commit letters under exactly the same rules. Call step() once per
+    processed frame, after the recognizer has seen that frame's landmarks.
+    """
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer
+
+        # State for prediction stability
+        self.prediction_buffer = "" # Holds the letter being evaluated
+        self.buffer_counter = 0
+        self.last_known_prediction = "" # The most recent prediction from the model
+        if AppConfig.PREDICTION_MODE == "window":
+            self.stability_threshold = AppConfig.WINDOW_STABILITY_THRESHOLD
+        else:
+            self.stability_threshold = AppConfig.STABILITY_THRESHOLD
+
+        # State for optimization
+        self.frame_count = 0
+        self.process_every_n_frame = 3 # Run the slow model 1 out of every 3 frames
+        # With adaptive inference the model runs when the hand moves instead
+        # of on a fixed cadence (see AdaptiveInferenceScheduler).
+        self.adaptive_inference = AppConfig.ADAPTIVE_INFERENCE
+        self.scheduler = AdaptiveInferenceScheduler(
+            still_threshold=AppConfig.MOTION_STILL_THRESHOLD,
+            transition_threshold=AppConfig.MOTION_TRANSITION_THRESHOLD,
+            base_interval=AppConfig.INFERENCE_BASE_INTERVAL,
+            transition_interval=AppConfig.INFERENCE_TRANSITION_INTERVAL,
+            hold_interval=AppConfig.INFERENCE_HOLD_INTERVAL,
+            max_per_second=AppConfig.MAX_INFERENCES_PER_SECOND,
+        )
+
+        # Set by step() for callers that measure the model separately
+        self.predicted = False
+        self.last_prediction = None # What the model returned when predicted is True
+        self.last_predict_seconds = 0.0
+
+    def step(self, now=None):
+        """
+        Runs one frame of the loop. `now` is the frame time in seconds
+        (defaults to the monotonic clock; replays pass their own timeline).
+        Returns the committed letter, or None.
+        """
+        self.predicted = False
+        # Run the heavy prediction model on the most recent landmarks.
+        self.frame_count += 1
+        if self.adaptive_inference:
+            self._run_adaptive_prediction(time.monotonic() if now is None else now)
+        elif self.frame_count % self.process_every_n_frame == 0:
+            self._predict()
+
+        # The stability logic runs every frame using the last prediction we got
+        # This makes the recording feel responsive again.
+        if self.last_known_prediction:
+            if self.last_known_prediction == self.prediction_buffer:
+                self.buffer_counter += 1
+            else:
+                self.prediction_buffer = self.last_known_prediction
+                self.buffer_counter = 1
+
+            if self.buffer_counter == self.stability_threshold:
+                letter = self.prediction_buffer
+                # Reset for the next letter
+                self.prediction_buffer = ""
+                self.buffer_counter = 0
+                self.last_known_prediction = ""
+                return letter
+        return None
+
+    def _predict(self):
+        start = time.perf_counter()
+        self.last_known_prediction = self.recognizer.predict()
+        self.last_predict_seconds = time.perf_counter() - start
+        self.last_prediction = self.last_known_prediction
+        self.predicted = True
+
+    def _run_adaptive_prediction(self, now):
+        if not self.recognizer.is_ready():
+            # Nothing to classify yet. A window refilling after a confident
+            # prediction reset it keeps that prediction, so the letter being
+            # held can still reach the stability threshold; only a lost hand
+            # makes it stale.
+            if not self.recognizer.hand_present:
+                self.last_known_prediction = None
+            return
+        landmarks = self.recognizer.snapshot_last_landmarks()
+        if landmarks is None:
+            return
+        if self.scheduler.should_run(landmarks, now):
+            self._predict()
+            self.scheduler.record_run(landmarks, now)
+
+    def reset_letter(self):
+        """Drops the letter being evaluated, e.g. after a word is saved."""
+        self.prediction_buffer = ""
+        self.buffer_counter = 0
+
+    def reset(self):
+        """Resets all prediction state."""
+        self.reset_letter()
+        self.frame_count = 0
+        self.last_known_prediction = ""
+        self.scheduler.reset()
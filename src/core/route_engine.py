@@ -0,0 +1,223 @@
+# route_engine.py
+
+import heapq
+import math
+
+# Cost of one floor on each kind of vertical edge, in walking-meter equivalents
+VERTICAL_COSTS = {"escalator": 20.0, "stairs": 25.0, "lift": 30.0}
+VERTICAL_NAMES = {"escalator": "eskalator", "stairs": "tangga", "lift": "lift"}
+
+STRAIGHT_ANGLE = 30 # Degrees of heading change still described as "lurus"
+U_TURN_ANGLE = 150 # Degrees of heading change described as turning around
+ARRIVAL_DISTANCE = 8 # A final walk this short is described as where the place is, not as a walk
+
+
+class RouteEngine:
+    """
+    Shortest-path routing over the mall floor graph (config/mall_graph.json).
+
+    A shortest-path tree is computed from every kiosk stand when the graph is
+    loaded, so a route is a walk up the tree's parent links. The Indonesian
+    turn-by-turn text for a (location, stand) pair is generated once from the
+    node positions and then cached.
+    """
+    def __init__(self, graph, knowledge_base=None):
+        graph = graph or {}
+        knowledge_base = knowledge_base or {}
+        self.floor_order = {floor["id"]: index for index, floor in enumerate(graph.get("floors", []))}
+        self.floor_names = {floor["id"]: floor.get("name", f"Lantai {floor['id']}") for floor in graph.get("floors", [])}
+        self.nodes = graph.get("nodes", {})
+        self.display_names = {
+            key: data.get("nama_display", key.replace('_', ' ').title()) for key, data in knowledge_base.items()
+        }
+
+        self.adjacency = {node_id: [] for node_id in self.nodes}
+        for edge in graph.get("edges", []):
+            start, end = edge["from"], edge["to"]
+            if start not in self.nodes or end not in self.nodes:
+                print(f"Warning: Mall graph edge {start} -> {end} refers to an unknown node.")
+                continue
+            edge_type = edge.get("type", "walk")
+            cost = edge.get("cost", self._edge_cost(start, end, edge_type))
+            self.adjacency[start].append((end, cost, edge_type))
+            self.adjacency[end].append((start, cost, edge_type))
+
+        self.stands = sorted(node_id for node_id, node in self.nodes.items() if node.get("type") == "stand")
+        self.trees = {stand: self._shortest_path_tree(stand) for stand in self.stands}
+        self._directions = {} # (location, stand) -> text or None
+
+    def _edge_cost(self, start, end, edge_type):
+        if edge_type == "walk":
+            return self._distance(start, end)
+        floors = abs(self.floor_order.get(self.nodes[start]["floor"], 0) - self.floor_order.get(self.nodes[end]["floor"], 0))
+        return VERTICAL_COSTS.get(edge_type, VERTICAL_COSTS["stairs"]) * max(floors, 1)
+
+    def _distance(self, start, end):
+        (x1, y1), (x2, y2) = self.nodes[start]["pos"], self.nodes[end]["pos"]
+        return math.hypot(x2 - x1, y2 - y1)
+
+    def _shortest_path_tree(self, source):
+        """Dijkstra from `source`. Returns node -> (previous node, edge type)."""
+        costs = {source: 0.0}
+        parents = {source: (None, None)}
+        heap = [(0.0, source)]
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > costs[node]:
+                continue
+            for neighbor, edge_cost, edge_type in self.adjacency[node]:
+                new_cost = cost + edge_cost
+                if new_cost < costs.get(neighbor, math.inf):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = (node, edge_type)
+                    heapq.heappush(heap, (new_cost, neighbor))
+        return parents
+
+    def route(self, location, stand_id):
+        """Returns [(node, edge type used to reach it)] from the stand to the location, or None."""
+        tree = self.trees.get(stand_id)
+        if tree is None or location not in tree:
+            return None
+        path = []
+        node, edge_type = location, None
+        while node is not None:
+            previous, edge_type = tree[node]
+            path.append((node, edge_type))
+            node = previous
+        path.reverse()
+        return path
+
+    def directions(self, location, stand_id):
+        """Returns turn-by-turn directions from the stand to the location, or None if there is no route."""
+        key = (location, stand_id)
+        if key not in self._directions:
+            path = self.route(location, stand_id)
+            self._directions[key] = self._describe(path) if path and len(path) > 1 else None
+        return self._directions[key]
+
+    def _name(self, node_id):
+        return self.nodes[node_id].get("name") or self.display_names.get(node_id, node_id.replace('_', ' '))
+
+    def _heading(self, start, end):
+        (x1, y1), (x2, y2) = self.nodes[start]["pos"], self.nodes[end]["pos"]
+        return math.degrees(math.atan2(y2 - y1, x2 - x1))
+
+    @staticmethod
+    def _turn(heading, new_heading):
+        """Classifies a heading change as "lurus", "kiri", "kanan" or "balik"."""
+        if heading is None:
+            return "lurus"
+        change = (new_heading - heading + 180) % 360 - 180 # Counter-clockwise is positive, i.e. left
+        if abs(change) <= STRAIGHT_ANGLE:
+            return "lurus"
+        if abs(change) >= U_TURN_ANGLE:
+            return "balik"
+        return "kiri" if change > 0 else "kanan"
+
+    @staticmethod
+    def _walk_text(turn, distance, landmark):
+        meters = max(5, int(round(distance / 5.0)) * 5)
+        target = f" ke {landmark}" if landmark else ""
+        if turn == "lurus":
+            return f"jalan lurus sekitar {meters} meter{target}"
+        start = "berbalik arah" if turn == "balik" else f"belok {turn}"
+        return f"{start} lalu jalan sekitar {meters} meter{target}"
+
+    def _describe(self, path):
+        steps = []
+        arrival = None
+        heading = self.nodes[path[0][0]].get("facing")
+        walk = None # [turn, distance, last node] of the walk being accumulated
+
+        def finish_walk():
+            if walk:
+                landmark = self._name(walk[2]) if self.nodes[walk[2]].get("type") != "location" else None
+                steps.append(self._walk_text(walk[0], walk[1], landmark))
+
+        index = 1
+        while index < len(path):
+            previous = path[index - 1][0]
+            node, edge_type = path[index]
+            if edge_type != "walk":
+                # Merge consecutive floors on the same escalator or lift into one step
+                while index + 1 < len(path) and path[index + 1][1] == edge_type:
+                    index += 1
+                node = path[index][0]
+                finish_walk()
+                walk = None
+                going_up = self.floor_order.get(self.nodes[node]["floor"], 0) > self.floor_order.get(self.nodes[previous]["floor"], 0)
+                vehicle = VERTICAL_NAMES.get(edge_type, edge_type)
+                steps.append(f"{'naik' if going_up else 'turun'} {vehicle} ke {self.floor_names.get(self.nodes[node]['floor'], self.nodes[node]['floor'])}")
+                heading = self.nodes[node].get("facing")
+                index += 1
+                continue
+
+            new_heading = self._heading(previous, node)
+            turn = self._turn(heading, new_heading)
+            distance = self._distance(previous, node)
+            is_last = index == len(path) - 1
+            if is_last and distance <= ARRIVAL_DISTANCE and turn != "balik":
+                finish_walk()
+                walk = None
+                side = "di depan" if turn == "lurus" else f"di sebelah {turn}"
+                arrival = f"{self._name(node)} ada {side} Anda."
+            elif walk and turn == "lurus":
+                walk[1] += distance
+                walk[2] = node
+            else:
+                finish_walk()
+                walk = [turn, distance, node]
+            heading = new_heading
+            index += 1
+
+        if walk:
+            finish_walk()
+        if arrival is None:
+            # The route ended on a longer walk, or on an escalator/lift/stairs ride into the destination
+            arrival = f"{self._name(path[-1][0])} ada di depan Anda."
+
+        sentences = [f"Dari sini, {steps[0]}."] if steps else []
+        sentences += [f"{step[0].upper()}{step[1:]}." for step in steps[1:]]
+        return " ".join(sentences + [arrival])
+
+
+if __name__ == '__main__':
+    # Prints every generated route, for checking the graph by eye:
+    #   python -m src.core.route_engine [mall_graph.json] [knowledge_base.json]
+    import json
+    import sys
+    import time
+    from src.config.config import AppConfig
+
+    graph_path = sys.argv[1] if len(sys.argv) > 1 else AppConfig.MALL_GRAPH_PATH
+    knowledge_base_path = sys.argv[2] if len(sys.argv) > 2 else AppConfig.KNOWLEDGE_BASE_PATH
+    with open(graph_path, 'r', encoding='utf-8') as f:
+        graph = json.load(f)
+    with open(knowledge_base_path, 'r', encoding='utf-8') as f:
+        knowledge_base = json.load(f)
+
+    # Self-check: a route whose last edge is vertical still ends with an arrival sentence
+    vertical_graph = {
+        "floors": [{"id": "G", "name": "Lantai G"}, {"id": "1", "name": "Lantai 1"}],
+        "nodes": {
+            "stand": {"type": "stand", "floor": "G", "pos": [0, 0], "facing": 0},
+            "escalator_g": {"type": "escalator", "floor": "G", "pos": [20, 0], "name": "Eskalator"},
+            "toko": {"type": "location", "floor": "1", "pos": [20, 0], "name": "Toko"},
+        },
+        "edges": [
+            {"from": "stand", "to": "escalator_g", "type": "walk"},
+            {"from": "escalator_g", "to": "toko", "type": "escalator"},
+        ],
+    }
+    vertical_text = RouteEngine(vertical_graph).directions("toko", "stand")
+    assert vertical_text.endswith("Toko ada di depan Anda."), vertical_text
+    print(f"[self-check: vertical final edge] {vertical_text}\n")
+
+    start = time.perf_counter()
+    engine = RouteEngine(graph, knowledge_base)
+    build_seconds = time.perf_counter() - start
+    print(f"{len(engine.nodes)} nodes, {len(engine.stands)} stands, trees built in {build_seconds * 1000:.1f} ms\n")
+    for stand in engine.stands:
+        for location in knowledge_base:
+            print(f"[{stand} -> {location}] {engine.directions(location, stand)}")
+        print()
@@ -2,19 +2,54 @@
 
 import cv2
 import json
+import threading
+import time
 import numpy as np
-import mediapipe as mp
-from tensorflow.keras.models import load_model
 from src.config.config import AppConfig
+from src.core.classifier_backends import load_classifier
+from src.core.landmark_buffer import LandmarkRingBuffer
+from src.core.metrics import timed
+
+
+def _aggregate_majority(probabilities):
+    """Each frame votes for its top class; confidence is the winning vote share."""
+    votes = np.bincount(np.argmax(probabilities, axis=1), minlength=probabilities.shape[1])
+    # Break ties between equally voted classes by their mean probability.
+    tied = np.flatnonzero(votes == votes.max())
+    class_index = tied[np.argmax(probabilities[:, tied].mean(axis=0))]
+    return class_index, votes[class_index] / len(probabilities)
+
+
+def _aggregate_mean(probabilities):
+    """Averages the class probabilities over the window."""
+    mean_probabilities = probabilities.mean(axis=0)
+    class_index = np.argmax(mean_probabilities)
+    return class_index, mean_probabilities[class_index]
+
+
+def _aggregate_weighted(probabilities):
+    """Averages the class probabilities, weighting each frame by its own confidence."""
+    weights = probabilities.max(axis=1)
+    weighted_probabilities = weights @ probabilities / weights.sum()
+    class_index = np.argmax(weighted_probabilities)
+    return class_index, weighted_probabilities[class_index]
+
+
+WINDOW_AGGREGATORS = {
+    "majority": _aggregate_majority,
+    "mean": _aggregate_mean,
+    "weighted": _aggregate_weighted,
+}
+
 
 class SignRecognizer:
-    def __init__(self):
+    def __init__(self, detect_hands=True):
+        """
+        detect_hands=False skips loading MediaPipe, for callers that feed
+        landmarks directly through push_landmarks (e.g. CSV replays).
+        """
         print("Initializing Sign Recognizer...")
-        self.model = load_model(AppConfig.MODEL_PATH)
-        self.sequence_length = AppConfig.SEQUENCE_LENGTH
-
-        self.landmark_sequence = [] # Stores the last sequence of detected landmarks
-        self.last_normalized_landmarks = None
+        self.load_timings = {} # Seconds spent in each loading phase, for the startup report
 
         try:
             with open(AppConfig.LABELS_PATH, 'r') as f:
@@ -24,50 +59,207 @@ class SignRecognizer:
             print(f"ERROR: '{AppConfig.LABELS_PATH}' not found.")
             self.class_names = []
         
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=1, 
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.2
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+        start = time.perf_counter()
+        self.model = self._load_model(AppConfig.INFERENCE_BACKEND)
+        self.load_timings["model"] = time.perf_counter() - start
+        self.sequence_length = AppConfig.SEQUENCE_LENGTH
+
+        self.prediction_mode = AppConfig.PREDICTION_MODE
+        if AppConfig.WINDOW_AGGREGATION not in WINDOW_AGGREGATORS:
+            raise ValueError(f"Unknown window aggregation: '{AppConfig.WINDOW_AGGREGATION}'")
+        self.aggregate_window = WINDOW_AGGREGATORS[AppConfig.WINDOW_AGGREGATION]
+
+        # Stores the last sequence of detected, normalized landmarks
+        self.landmark_buffer = LandmarkRingBuffer(self.sequence_length)
+        # Reused model inputs, filled from the buffer under the lock
+        self._last_frame_input = np.empty((1,) + self.landmark_buffer.data.shape[1:], dtype=np.float32)
+        self._window_input = np.empty_like(self.landmark_buffer.data)
+        # Detection and prediction may run on different pipeline threads.
+        self._sequence_lock = threading.Lock()
+        # Whether the last frame had a hand; the window alone cannot tell a
+        # lost hand from one refilling after a prediction reset it
+        self.hand_present = False
+
+        # Hand-ROI tracking: (x0, y0, x1, y1) pixel box around the last detected hand
+        self.roi_tracking = AppConfig.ROI_TRACKING
+        self.roi = None
+        # Which path found (or missed) the hand in the last frame: "roi", "roi_lost" or "full_frame"
+        self.last_detection_path = None
+
+        self.hands = None
+        self.roi_hands = None
+        if detect_hands:
+            start = time.perf_counter()
+            import mediapipe as mp
+            self.mp_hands = mp.solutions.hands
+            # MediaPipe's tracker keeps landmarks in the coordinates of the
+            # last image it saw, so ROI crops and full frames each get their
+            # own instance. With ROI tracking the full frame is only searched
+            # while no hand is tracked, so that instance carries no tracker
+            # state that could go stale between searches.
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=self.roi_tracking,
+                max_num_hands=1, 
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.2
+            )
+            if self.roi_tracking:
+                self.roi_hands = self.mp_hands.Hands(
+                    max_num_hands=1,
+                    min_detection_confidence=0.7,
+                    min_tracking_confidence=0.2
+                )
+            self.mp_drawing = mp.solutions.drawing_utils
+            self.load_timings["mediapipe"] = time.perf_counter() - start
         print("Sign Recognizer initialized successfully.")
 
+    def warm_up(self):
+        """
+        Runs one throw-away detection and prediction so the first real frame
+        does not pay for graph initialization and lazy allocations.
+        """
+        start = time.perf_counter()
+        if self.hands is not None:
+            blank_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+            self.hands.process(blank_frame)
+            if self.roi_hands is not None:
+                self.roi_hands.process(blank_frame[:AppConfig.ROI_INPUT_SIZE, :AppConfig.ROI_INPUT_SIZE])
+        self.model.predict(np.zeros((1, 21, 3), dtype=np.float32), verbose=0)
+
+        with self._sequence_lock:
+            self.landmark_buffer.clear()
+        self.load_timings["warm_up"] = time.perf_counter() - start
+
+    def _load_model(self, backend):
+        """
+        Loads the classifier for the configured backend (see
+        src/core/classifier_backends.py). TensorFlow is only imported when
+        the Keras backend is explicitly requested.
+        """
+        return load_classifier(backend, self.class_names)
+
+    @timed("sign_recognizer_detect_seconds", "Hand detection, drawing and landmark extraction per frame.")
     def detect_and_draw_landmarks(self, frame):
         """
         Detects, draws, and stores hand landmarks. Runs on every frame.
         Returns the frame with landmarks drawn on it.
         """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(frame_rgb)
+        hand_landmarks = self._find_hand(frame)
         
-        if results.multi_hand_landmarks:
-            hand_landmarks = results.multi_hand_landmarks[0]
+        if hand_landmarks is not None:
             # Draw the skeleton on the original frame
             self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
             
-            # Extract, normalize, and store the landmark data
-            normalized_landmarks = self._extract_landmarks(hand_landmarks)
-            self.last_normalized_landmarks = normalized_landmarks
-            self.landmark_sequence.append(self.last_normalized_landmarks)
-            self.landmark_sequence = self.landmark_sequence[-self.sequence_length:]
+            # Extract and normalize the landmark data straight into the buffer
+            with self._sequence_lock:
+                self.landmark_buffer.push_hand_landmarks(hand_landmarks)
+                self.hand_present = True
         else:
-            self.landmark_sequence =''
-            self.last_normalized_landmarks = None
+            with self._sequence_lock:
+                self.landmark_buffer.clear()
+                self.hand_present = False
 
         return frame
 
+    def push_landmarks(self, landmarks):
+        """
+        Adds one frame of raw (21, 3) landmarks, or None for "no hand", to the
+        window without running MediaPipe. Used when replaying recorded landmarks.
+        """
+        with self._sequence_lock:
+            if landmarks is None:
+                self.landmark_buffer.clear()
+            else:
+                self.landmark_buffer.push_raw_landmarks(landmarks)
+            self.hand_present = landmarks is not None
+
+    def _find_hand(self, frame):
+        """
+        Runs MediaPipe on the tracked hand ROI when there is one, falling back
+        to a (downscaled) full-frame search when tracking is lost.
+        Returns hand landmarks in full-frame normalized coordinates, or None.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        hand_landmarks = None
+        self.last_detection_path = "full_frame"
+
+        if self.roi_tracking and self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            hand_landmarks = self._process_region(self.roi_hands, frame[y0:y1, x0:x1], AppConfig.ROI_INPUT_SIZE)
+            if hand_landmarks is not None:
+                self._map_from_roi(hand_landmarks, self.roi, frame_w, frame_h)
+                self.last_detection_path = "roi"
+            else:
+                # This frame pays for the ROI attempt and the full-frame search
+                self.roi = None
+                self.last_detection_path = "roi_lost"
+
+        if hand_landmarks is None:
+            hand_landmarks = self._process_region(self.hands, frame, AppConfig.FULL_FRAME_INPUT_SIZE)
+
+        if self.roi_tracking and hand_landmarks is not None:
+            self.roi = self._roi_from_landmarks(hand_landmarks, frame_w, frame_h)
+        return hand_landmarks
+
+    @staticmethod
+    def _process_region(hands, region, max_side):
+        """Downscales a BGR region so its longest side is at most max_side and runs `hands` on it."""
+        region_h, region_w = region.shape[:2]
+        scale = max_side / max(region_h, region_w)
+        if scale < 1:
+            region = cv2.resize(region, (int(region_w * scale), int(region_h * scale)), interpolation=cv2.INTER_LINEAR)
+        results = hands.process(cv2.cvtColor(region, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            return results.multi_hand_landmarks[0]
+        return None
+
+    @staticmethod
+    def _map_from_roi(hand_landmarks, roi, frame_w, frame_h):
+        """Converts landmarks normalized to the ROI into frame-normalized coordinates, in place."""
+        x0, y0, x1, y1 = roi
+        roi_w, roi_h = x1 - x0, y1 - y0
+        for lm in hand_landmarks.landmark:
+            lm.x = (x0 + lm.x * roi_w) / frame_w
+            lm.y = (y0 + lm.y * roi_h) / frame_h
+            lm.z = lm.z * roi_w / frame_w # MediaPipe scales z like x
+
+    @staticmethod
+    def _roi_from_landmarks(hand_landmarks, frame_w, frame_h):
+        """Builds a padded square pixel box around the hand, clamped to the frame."""
+        xs = [lm.x * frame_w for lm in hand_landmarks.landmark]
+        ys = [lm.y * frame_h for lm in hand_landmarks.landmark]
+        center_x = (min(xs) + max(xs)) / 2
+        center_y = (min(ys) + max(ys)) / 2
+        side = max(max(xs) - min(xs), max(ys) - min(ys)) * (1 + 2 * AppConfig.ROI_PADDING)
+        side = min(max(side, AppConfig.ROI_MIN_SIZE), frame_w, frame_h)
+
+        x0 = int(min(max(center_x - side / 2, 0), frame_w - side))
+        y0 = int(min(max(center_y - side / 2, 0), frame_h - side))
+        return x0, y0, x0 + int(side), y0 + int(side)
+
+    def predict(self):
+        """
+        Runs the prediction for the configured mode ("last_frame" or "window").
+        Returns a prediction string (e.g., "A") or None.
+        """
+        if self.prediction_mode == "window":
+            return self.predict_from_window()
+        return self.predict_from_last_landmarks()
+
+    @timed("sign_recognizer_predict_seconds", "Single-frame classification.")
     def predict_from_last_landmarks(self):
         """
         Uses the stored landmark data to make a prediction. Runs intermittently.
         Returns a prediction string (e.g., "A") or None.
         """
-        # Only predict if we have a full sequence of detected frames
-        if len(self.landmark_sequence) < self.sequence_length or self.last_normalized_landmarks is None:
-            return None
+        with self._sequence_lock:
+            # Only predict if we have a full sequence of detected frames
+            if not self.landmark_buffer.is_full():
+                return None
 
-        # Prepare the landmark data for the model (add a batch dimension)
-        input_data = np.expand_dims(self.last_normalized_landmarks, axis=0)
+            # Prepare the landmark data for the model (batch of one)
+            input_data = self._last_frame_input
+            input_data[0] = self.landmark_buffer.last()
         
         # Make the slow prediction
         prediction = self.model.predict(input_data, verbose=0)
@@ -79,23 +271,56 @@ class SignRecognizer:
         if confidence > AppConfig.CONFIDENCE_THRESHOLD: 
             if self.class_names:
                 predicted_word = self.class_names[predicted_class_index]        
-            self.landmark_sequence = []
+            self.reset_sequence()
                     
         return predicted_word
 
-
-    def _extract_landmarks(self, hand_landmarks):
+    @timed("sign_recognizer_predict_window_seconds", "Batched classification of the landmark window.")
+    def predict_from_window(self):
         """
-        Extracts and normalizes landmarks. (This method is unchanged).
+        Classifies every frame of the landmark window in one batched call and
+        combines the per-frame probabilities with the configured aggregation.
+        Returns a prediction string (e.g., "A") or None.
         """
-        landmarks = np.array([[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark])
-        wrist = landmarks[0]
-        relative_landmarks = landmarks - wrist
-        max_dist = np.max(np.linalg.norm(relative_landmarks, axis=1))
-        if max_dist == 0:
-            return np.zeros_like(relative_landmarks)
-        normalized_landmarks = relative_landmarks / max_dist
-        return normalized_landmarks
+        with self._sequence_lock:
+            if not self.landmark_buffer.is_full():
+                return None
+            window = self.landmark_buffer.window(out=self._window_input)
+
+        probabilities = self.model.predict(window, verbose=0)
+        predicted_class_index, confidence = self.aggregate_window(probabilities)
+
+        predicted_word = None
+        if confidence > AppConfig.CONFIDENCE_THRESHOLD:
+            if self.class_names:
+                predicted_word = self.class_names[predicted_class_index]
+            self.reset_sequence()
+
+        return predicted_word
+
+    def reset_sequence(self):
+        """Clears the landmark window so the next prediction needs a fresh one."""
+        with self._sequence_lock:
+            self.landmark_buffer.clear()
+
+    def is_ready(self):
+        """True once the landmark window is full and a prediction can run."""
+        with self._sequence_lock:
+            return self.landmark_buffer.is_full()
+
+    def snapshot_last_landmarks(self):
+        """Returns a copy of the most recent normalized landmarks, or None."""
+        with self._sequence_lock:
+            last = self.landmark_buffer.last()
+            return None if last is None else last.copy()
+
+    @property
+    def last_normalized_landmarks(self):
+        """The most recent normalized (21, 3) landmarks, or None if no hand is tracked."""
+        return self.landmark_buffer.last()
 
     def close(self):
-        self.hands.close()
\ No newline at end of file
+        if self.hands is not None:
+            self.hands.close()
+        if self.roi_hands is not None:
+            self.roi_hands.close()
\ No newline at end of file
@@ -1,41 +1,84 @@
 import json
-from difflib import get_close_matches
+from collections import Counter
 from src.config.config import AppConfig
+from src.core.fuzzy_index import FuzzyIndex, parse_confusion_costs
+from src.core.knowledge_store import get_knowledge_store
+from src.core.metrics import timed
+from src.core.prefix_index import PrefixIndex
+from src.core.word_segmenter import WordSegmenter
+
+class TextIndexes:
+    """The vocabulary and every lookup structure built from it, for one knowledge snapshot."""
+    def __init__(self, word_counts, letter_confusions, suggestion_weights=None):
+        self.word_counts = word_counts
+        self.vocabulary = sorted(word_counts)
+        substitution_costs, default_cost = parse_confusion_costs(letter_confusions)
+        self.segmenter = WordSegmenter(word_counts, AppConfig.SEGMENTATION_MAX_EDITS,
+                                       substitution_costs, default_cost)
+        # Space-stripped form -> phrase, for resolving a noisy run of letters to one phrase
+        self.phrases_by_key = {phrase.replace(" ", ""): phrase for phrase in self.vocabulary}
+        self.fuzzy_index = FuzzyIndex(self.phrases_by_key, AppConfig.FUZZY_MAX_EDITS,
+                                      substitution_costs, default_cost)
+        self.prefix_index = PrefixIndex(suggestion_weights or word_counts)
 
 class TextProcessor:
     """
     A utility class to handle text correction and suggestions.
     """
-    def __init__(self):
+    def __init__(self, store=None):
         """
-        Initializes the processor and builds a vocabulary from multiple sources.
+        Initializes the processor and builds a vocabulary from multiple sources,
+        read from the shared KnowledgeStore (and rebuilt when they change).
         """
-        self.vocabulary = self._build_vocabulary(AppConfig.KNOWLEDGE_BASE_PATH, AppConfig.NLP_CONFIG_PATH)
+        self.store = store or get_knowledge_store()
+        self.store.register_index("text_processor", self.build_indexes)
         print(f"TextProcessor initialized with {len(self.vocabulary)} vocabulary words.")
 
-    def _build_vocabulary(self, kb_path, config_path):
+    @property
+    def indexes(self):
+        return self.store.snapshot.index("text_processor")
+
+    @property
+    def vocabulary(self):
+        return self.indexes.vocabulary
+
+    @classmethod
+    def build_indexes(cls, snapshot):
+        """Builds the TextIndexes for a knowledge snapshot (run by the store on every reload)."""
+        word_counts = cls._build_vocabulary(snapshot.knowledge_base, snapshot.nlp_config)
+        suggestion_weights = cls._build_suggestion_weights(word_counts, snapshot.knowledge_base)
+        return TextIndexes(word_counts, snapshot.letter_confusions, suggestion_weights)
+
+    @staticmethod
+    def _build_vocabulary(kb_data, config_data):
         """
-        Loads the knowledge base and NLP config to create a comprehensive
-        dictionary of all known correct words and phrases.
+        Combines the knowledge base and NLP config into a comprehensive
+        dictionary of all known correct words and phrases, counted by how
+        often each one appears across those sources.
         """
-        vocab = set()
-        try:
-            with open(kb_path, 'r', encoding='utf-8') as f:
-                kb_data = json.load(f)
-                vocab.update(kb_data.keys())
-        except FileNotFoundError:
-            print(f"Warning: Knowledge base not found at '{kb_path}' for TextProcessor.")
+        vocab = Counter()
+        # Keys are stored as "food_court"; users type "food court"
+        vocab.update(key.replace('_', ' ') for key in kb_data)
+        for intent in config_data.get('intents', {}).values():
+            vocab.update(intent.get('keywords', []))
+        return vocab
 
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                for intent in config_data.get('intents', {}).values():
-                    vocab.update(intent.get('keywords', []))
-        except FileNotFoundError:
-            print(f"Warning: NLP config not found at '{config_path}' for TextProcessor.")
-            
-        return sorted(list(vocab))
+    @staticmethod
+    def _build_suggestion_weights(word_counts, kb_data):
+        """
+        Ranking weights for autocomplete. Almost every vocabulary count is 1,
+        which would leave suggestions in alphabetical order, so each place
+        also gets its knowledge-base weight: its "popularity" field when the
+        entry has one, else its number of keywords (how many ways visitors
+        ask for it). Intent keywords keep their count, so places come first.
+        """
+        weights = Counter(word_counts)
+        for key, entry in kb_data.items():
+            popularity = entry.get('popularity', len(entry.get('keywords', [])))
+            weights[key.replace('_', ' ')] += popularity
+        return weights
 
+    @timed("text_processor_correct_sentence_seconds", "Segmentation and correction of a raw letter string.")
     def correct_sentence(self, raw_text):
         """
         Takes a raw, concatenated string of letters and splits it into
@@ -43,50 +86,45 @@ class TextProcessor:
         
         Example: "dmntoilet" -> "dmn toilet"
         """
-        raw_text = raw_text.lower()
+        raw_text = raw_text.lower().replace(" ", "")
+        indexes = self.indexes # One snapshot for the whole sentence
         corrected_words = []
-        
-        while raw_text:
-            matches = [v for v in self.vocabulary if raw_text.startswith(v.replace(" ", ""))]
-            
-            if not matches:
-                found_word = False
-                for i in range(len(raw_text), 0, -1):
-                    partial_word = raw_text[:i]
-                    close_matches = get_close_matches(partial_word, self.vocabulary, n=1, cutoff=0.7)
-                    if close_matches:
-                        best_match = close_matches[0]
-                        corrected_words.append(best_match)
-                        raw_text = raw_text[len(partial_word):]
-                        found_word = True
-                        break
-                if not found_word:
-                    print(f"Could not correct: {raw_text}")
-                    break
-            else:
-                best_match = max(matches, key=len)
-                corrected_words.append(best_match)
-                raw_text = raw_text[len(best_match.replace(" ", "")):]
-
+        for word in indexes.segmenter.segment(raw_text):
+            if word not in indexes.word_counts:
+                # Letters the segmenter could not place; try them as one noisy phrase
+                resolved = self._resolve_word(indexes, word)
+                if resolved is None:
+                    print(f"Could not correct: {word}")
+                else:
+                    word = resolved
+            corrected_words.append(word)
         return " ".join(corrected_words)
 
-    def get_suggestions(self, current_text):
+    def resolve_word(self, word):
         """
-        Provides auto-complete suggestions for the last word being typed.
-        
-        Example: "di mana toko s" -> ["sepatu"]
+        Returns the vocabulary phrase closest to a single misrecognized word,
+        or None if it is too short or nothing is close enough.
         """
-        current_text = current_text.lower()
-        words = current_text.split()
-        
-        if not words or current_text.endswith(' '):
-            return []
+        return self._resolve_word(self.indexes, word)
 
-        partial_word = words[-1]
-        
-        suggestions = [v for v in self.vocabulary if v.startswith(partial_word)]
+    def _resolve_word(self, indexes, word):
+        key = word.lower().replace(" ", "")
+        if key in indexes.phrases_by_key:
+            return indexes.phrases_by_key[key]
+        if len(key) < AppConfig.FUZZY_MIN_WORD_LENGTH:
+            return None
+        match = indexes.fuzzy_index.best(key)
+        return indexes.phrases_by_key[match] if match else None
+
+    @timed("text_processor_suggestions_seconds", "Autocomplete lookup for the text being typed.")
+    def get_suggestions(self, current_text, limit=None):
+        """
+        Provides auto-complete suggestions for the words being typed, ranked
+        by how often they appear in the knowledge sources.
         
-        return suggestions
+        Example: "di mana toko s" -> ["toko sepatu"]
+        """
+        return self.indexes.prefix_index.suggest(current_text, limit or AppConfig.SUGGESTION_LIMIT)
 
 if __name__ == '__main__':
     # Create dummy knowledge base and config for testing
@@ -101,8 +139,11 @@ if __name__ == '__main__':
     }
     with open('nlp_config.json', 'w', encoding='utf-8') as f:
         json.dump(nlp_config_data, f)
-        
-    processor = TextProcessor()
+
+    from src.core.knowledge_store import KnowledgeStore
+    processor = TextProcessor(KnowledgeStore({
+        "knowledge_base": 'mall_knowledge_base.json', "nlp_config": 'nlp_config.json'
+    }))
     
     print("\n Testing Auto-Correction ")
     correction_cases = ["dmntoilet", "caritokosepatu", "dimanabioskop"]
@@ -115,3 +156,14 @@ if __name__ == '__main__':
     for case in completion_cases:
         suggestions = processor.get_suggestions(case)
         print(f"Input: '{case}' -> Suggestions: {suggestions}")
+
+    # A more popular place must sort above an alphabetically earlier one
+    ranked = TextProcessor.build_indexes(type("Snapshot", (), {
+        "knowledge_base": {"toko buku": {"keywords": ["buku"]},
+                           "toilet": {"keywords": ["toilet", "wc", "kamar kecil"]},
+                           "taman": {"keywords": ["taman"], "popularity": 10}},
+        "nlp_config": {}, "letter_confusions": {},
+    })()).prefix_index
+    assert ranked.complete("to") == ["toilet", "toko buku"], ranked.complete("to")
+    assert ranked.complete("t") == ["taman", "toilet", "toko buku"], ranked.complete("t")
+    print("Ranking check passed.")
@@ -0,0 +1,67 @@
+# tflite_classifier.py
+
+import numpy as np
+
+
+def _interpreter_class():
+    """
+    The TFLite interpreter from the lightest package installed: ai-edge-litert
+    (in requirements.txt, and the only one in the frozen bundle, which has no
+    TensorFlow) or tflite-runtime, else the deprecated one inside TensorFlow.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite.python.interpreter import Interpreter
+    return Interpreter
+
+
+class TFLiteClassifier:
+    """
+    Runs a TFLite export of the SIBI model (see src/tools/export_tflite.py).
+
+    Float32, float16 and int8 models are all supported. For an int8 model
+    the landmarks are quantized with the input tensor's scale and zero point,
+    and the outputs are dequantized back to probabilities, so callers always
+    pass and get float32 like with the other backends.
+    """
+    def __init__(self, model_path, num_threads=None):
+        self.interpreter = _interpreter_class()(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self._input_index = input_details['index']
+        self._output_index = output_details['index']
+        self._input_dtype = input_details['dtype']
+        self._input_shape = tuple(input_details['shape'])
+        # A scale of 0 means the tensor is not quantized
+        self._input_quantization = input_details['quantization']
+        self._output_quantization = output_details['quantization']
+        self.quantized = self._input_quantization[0] != 0
+
+    def _quantize(self, x):
+        scale, zero_point = self._input_quantization
+        info = np.iinfo(self._input_dtype)
+        return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(self._input_dtype)
+
+    def predict(self, input_data, verbose=0):
+        """
+        Mirrors keras.Model.predict for a batch of (21, 3) landmark arrays.
+        Returns an (N, num_classes) array of probabilities.
+        """
+        x = np.asarray(input_data, dtype=np.float32)
+        if x.shape != self._input_shape:
+            # Resizing reallocates, so it only happens when the batch size changes
+            self.interpreter.resize_tensor_input(self._input_index, x.shape)
+            self.interpreter.allocate_tensors()
+            self._input_shape = x.shape
+        self.interpreter.set_tensor(self._input_index, self._quantize(x) if self.quantized else x)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output_index)
+        scale, zero_point = self._output_quantization
+        if scale != 0:
+            return (output.astype(np.float32) - zero_point) * scale
+        return output.copy() # get_tensor's buffer is overwritten by the next invoke
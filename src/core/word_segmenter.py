@@ -0,0 +1,166 @@
+# word_segmenter.py
+
+import math
+
+
+class WordSegmenter:
+    """
+    Splits an unspaced letter string into the cheapest sequence of vocabulary
+    words, Viterbi-style.
+
+    The vocabulary is stored in a character trie keyed by each phrase with its
+    spaces removed ("di mana" -> "dimana"). From every position of the input
+    the trie is walked once, with a small edit budget, to find all words that
+    start there; the dynamic program then picks the segmentation with the
+    lowest total cost. A word costs WORD_COST, plus EDIT_COST per edit needed
+    to match the input, plus a small penalty for rare words. Substituting a
+    letter the recognizer often confuses costs less than a full edit (see
+    config/letter_confusions.json). Letters that no word covers cost
+    UNKNOWN_CHAR_COST each and are kept as raw text.
+    """
+    WORD_COST = 1.0
+    EDIT_COST = 1.0
+    UNKNOWN_CHAR_COST = 1.5
+    FREQUENCY_WEIGHT = 0.1
+
+    def __init__(self, word_counts, max_edits=2, substitution_costs=None, default_substitution_cost=1.0):
+        """
+        Args:
+            word_counts (dict): vocabulary phrase -> how often it occurs in the
+                knowledge sources (higher means preferred).
+            max_edits (int): the largest edit budget for any single word.
+            substitution_costs (dict): (typed letter, word letter) -> cost for
+                letters that are easily confused.
+            default_substitution_cost (float): cost of any other substitution.
+        """
+        self.max_edits = max_edits
+        self.substitution_costs = substitution_costs or {}
+        self.default_substitution_cost = default_substitution_cost
+        self._children = [{}] # node -> {char: node}
+        self._words = [None] # node -> (phrase, cost) for the best phrase ending here
+        self._depth = [0]
+        self._longest = [0] # node -> length of the longest key in its subtree
+
+        highest_count = max(word_counts.values(), default=1)
+        for phrase, count in word_counts.items():
+            key = phrase.replace(" ", "")
+            if not key:
+                continue
+            cost = self.WORD_COST + self.FREQUENCY_WEIGHT * math.log(highest_count / max(count, 1))
+            self._add(key, phrase, cost)
+
+    def __len__(self):
+        return sum(word is not None for word in self._words)
+
+    def _add(self, key, phrase, cost):
+        node = 0
+        for char in key:
+            next_node = self._children[node].get(char)
+            if next_node is None:
+                next_node = len(self._children)
+                self._children[node][char] = next_node
+                self._children.append({})
+                self._words.append(None)
+                self._depth.append(self._depth[node] + 1)
+                self._longest.append(0)
+            self._longest[node] = max(self._longest[node], len(key))
+            node = next_node
+        self._longest[node] = max(self._longest[node], len(key))
+        current = self._words[node]
+        # Several phrases can share a key; keep the cheapest, then the longest (as before).
+        if current is None or (cost, -len(phrase)) < (current[1], -len(current[0])):
+            self._words[node] = (phrase, cost)
+
+    def allowed_edits(self, length):
+        """Short words must match exactly; longer ones tolerate one edit per four letters."""
+        return min(self.max_edits, length // 4)
+
+    def _words_from(self, text, start):
+        """
+        Returns {end: (cost, phrase)} for the cheapest vocabulary word matching
+        text[start:end], allowing substitutions, insertions, deletions and swaps.
+        """
+        length = len(text)
+        candidates = {}
+        stack = [(0, start, 0, 0.0)]
+        best_costs = {} # (node, offset, edits) -> cheapest edit cost seen
+        while stack:
+            node, offset, edits, edit_cost = stack.pop()
+            state = (node, offset, edits)
+            if best_costs.get(state, math.inf) <= edit_cost:
+                continue
+            best_costs[state] = edit_cost
+            if edits > self.allowed_edits(self._longest[node]):
+                continue # No word below this node is long enough to absorb that many edits
+
+            word = self._words[node]
+            if word is not None and offset > start and edits <= self.allowed_edits(self._depth[node]):
+                cost = word[1] + self.EDIT_COST * edit_cost
+                if offset not in candidates or cost < candidates[offset][0]:
+                    candidates[offset] = (cost, word[0])
+
+            children = self._children[node]
+            char = text[offset] if offset < length else None
+            exact_child = children.get(char)
+            if exact_child is not None:
+                stack.append((exact_child, offset + 1, edits, edit_cost))
+            # Spend the edit budget gradually along the word, so that the first
+            # few letters cannot all be edits (which would match half the trie).
+            if edits >= min(self.max_edits, 1 + self._depth[node] // 4):
+                continue
+            for child_char, child in children.items():
+                if char is not None and child_char != char:
+                    substitution = self.substitution_costs.get((char, child_char), self.default_substitution_cost)
+                    stack.append((child, offset + 1, edits + 1, edit_cost + substitution)) # substituted letter
+                stack.append((child, offset, edits + 1, edit_cost + 1)) # letter missing from the input
+            if node and char is not None:
+                stack.append((node, offset + 1, edits + 1, edit_cost + 1)) # extra letter in the input
+            if offset + 1 < length:
+                swapped_child = children.get(text[offset + 1])
+                if swapped_child is not None and text[offset + 1] != char:
+                    grandchild = self._children[swapped_child].get(char)
+                    if grandchild is not None:
+                        stack.append((grandchild, offset + 2, edits + 1, edit_cost + 1)) # two letters swapped
+        return candidates
+
+    def segment(self, text):
+        """
+        Returns the lowest-cost segmentation of `text` as a list of tokens.
+        Vocabulary words are returned in their spaced form; runs of letters
+        that match nothing are returned as they were typed.
+        """
+        length = len(text)
+        best_cost = [0.0] + [math.inf] * length
+        back = [None] * (length + 1) # end -> (start, phrase or None for an unknown letter)
+
+        for start in range(length):
+            if best_cost[start] == math.inf:
+                continue
+            base = best_cost[start]
+            unknown_cost = base + self.UNKNOWN_CHAR_COST
+            if unknown_cost < best_cost[start + 1]:
+                best_cost[start + 1] = unknown_cost
+                back[start + 1] = (start, None)
+            for end, (cost, phrase) in self._words_from(text, start).items():
+                if base + cost < best_cost[end]:
+                    best_cost[end] = base + cost
+                    back[end] = (start, phrase)
+
+        tokens = []
+        end = length
+        unknown_end = None
+        while end > 0:
+            start, phrase = back[end]
+            if phrase is None:
+                if unknown_end is None:
+                    unknown_end = end
+            else:
+                if unknown_end is not None:
+                    tokens.append(text[end:unknown_end])
+                    unknown_end = None
+                tokens.append(phrase)
+            end = start
+        if unknown_end is not None:
+            tokens.append(text[:unknown_end])
+        tokens.reverse()
+        return tokens
@@ -1,121 +1,203 @@
-# camera_service.py (Corrected and Optimized)
+# camera_service.py (Pipelined)
 
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QTimer
+import threading
+import time
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QImage
 import cv2
-from src.core.sign_recognizer import SignRecognizer
+import numpy as np
 from src.config.config import AppConfig
+from src.core.metrics import timed
+from src.core.recognition_loop import RecognitionLoop
+from src.services.frame_pipeline import LatestQueue, PipelineStage
 
 class CameraService(QObject):
     frame_ready = pyqtSignal(QImage)
     sentence_updated = pyqtSignal(str)
     full_sentence_updated = pyqtSignal(str)
     
-    def __init__(self):
+    def __init__(self, recognizer=None):
         super().__init__()
         self.cap = None
-        self.recognizer = SignRecognizer()
+        self.recognizer = recognizer # Set later by the startup loader if not given here
         
         # State for sentence building
         self.current_letters = []
         self.words = []
         
-        # State for prediction stability
-        self.prediction_buffer = "" # Holds the letter being evaluated
-        self.buffer_counter = 0
-        self.last_known_prediction = "" # The most recent prediction from the model
+        # Prediction cadence and letter stability, shared with the replay benchmark
+        self.loop = RecognitionLoop(recognizer)
 
-        # State for optimization
-        self.frame_count = 0 
-        self.process_every_n_frame = 3 # Run the slow model 1 out of every 3 frames
+        # Capture, landmark detection, classification and display conversion
+        # run as separate stages joined by small queues that keep only the
+        # newest item, so a slow stage never stalls the ones before it.
+        # Sentence state is touched by the classify stage and by the Qt slots,
+        # so it is guarded by a lock.
+        self._state_lock = threading.RLock()
+        self.stages = []
+        self.queues = []
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._process_single_frame)
+        # Display path: frames are scaled on the worker to the size of the
+        # video label, capped at DISPLAY_FPS, and only one frame is in flight
+        # to the GUI at a time (the GUI calls mark_frame_consumed()).
+        self.display_size = None # (width, height) of the video label
+        self.display_interval = 1.0 / AppConfig.DISPLAY_FPS
+        self._last_display_time = 0.0
+        self._display_buffer = None # Reused scaled BGR frame; the emitted QImage is a copy of it
+        self._frame_consumed = threading.Event()
+        self._frame_consumed.set()
+        self.display_stats = {"emitted": 0, "skipped_rate": 0, "skipped_busy": 0}
+
+    def set_recognizer(self, recognizer):
+        """Attaches the recognizer once it has been loaded in the background."""
+        self.recognizer = recognizer
+        self.loop.recognizer = recognizer
 
     @pyqtSlot()
     def start_camera(self):
-        if not self.timer.isActive():
+        if self.recognizer is None:
+            print("Camera requested before the recognizer finished loading.")
+            return
+        if not self.stages:
             self.clear_all()
             self.cap = cv2.VideoCapture(0)
             if not self.cap.isOpened(): return
-            self.timer.start(33) # ~30 FPS
+            self._frame_consumed.set()
+            self._start_pipeline()
+
+    def set_display_size(self, width, height):
+        """Called by the GUI when the video label is resized."""
+        self.display_size = (width, height)
+
+    def mark_frame_consumed(self):
+        """Called by the GUI once it has copied the last emitted frame."""
+        self._frame_consumed.set()
 
     @pyqtSlot()
     def stop_camera(self):
-        if self.timer.isActive():
-            self.timer.stop()
+        if self.stages:
+            for stage in self.stages:
+                stage.stop()
+            for stage in self.stages:
+                stage.join()
+            self.stages = []
             if self.cap: 
                 self.cap.release()
                 self.cap = None
 
-    def _process_single_frame(self):
-        if not self.cap: return
+    def _start_pipeline(self):
+        size = AppConfig.PIPELINE_QUEUE_SIZE
+        self.landmark_queue = LatestQueue("landmark", size)
+        self.classify_queue = LatestQueue("classify", size)
+        self.display_queue = LatestQueue("display", size)
+        self.queues = [self.landmark_queue, self.classify_queue, self.display_queue]
+        self.stages = [
+            PipelineStage("capture", self._capture_frame),
+            PipelineStage("landmark", self._detect_landmarks, self.landmark_queue),
+            PipelineStage("classify", self._classify, self.classify_queue),
+            PipelineStage("display", self._emit_frame, self.display_queue),
+        ]
+        for stage in self.stages:
+            stage.start()
+
+    def get_pipeline_stats(self):
+        """Returns per-stage processed counts and per-queue depth and drop counters."""
+        return {
+            "stages": {stage.name: stage.stats() for stage in self.stages},
+            "queues": {queue.name: queue.stats() for queue in self.queues},
+            "scheduler": self.loop.scheduler.stats(),
+            "display": dict(self.display_stats),
+        }
+
+    def _capture_frame(self):
+        # Blocks at the camera's own frame rate.
         ret, frame = self.cap.read()
-        if not ret: return
+        if not ret:
+            time.sleep(0.01)
+            return
+        self.landmark_queue.put(cv2.flip(frame, 1))
 
-        frame = cv2.flip(frame, 1)
-        
+    def _detect_landmarks(self, frame):
         annotated_frame = self.recognizer.detect_and_draw_landmarks(frame)
-        
-        # Run the heavy prediction model on the most recent landmarks.
-        self.frame_count += 1
-        if self.frame_count % self.process_every_n_frame == 0:
-            
-            self.last_known_prediction = self.recognizer.predict_from_last_landmarks()
-
-        # The stability logic now runs every frame using the last prediction we got
-        # This makes the recording feel responsive again.
-        if self.last_known_prediction:
-            if self.last_known_prediction == self.prediction_buffer:
-                self.buffer_counter += 1
-            else:
-                self.prediction_buffer = self.last_known_prediction
-                self.buffer_counter = 1
-            
-            if self.buffer_counter == AppConfig.STABILITY_THRESHOLD:
-                self.current_letters.append(self.prediction_buffer)
+        self.classify_queue.put(True)
+        self.display_queue.put(annotated_frame)
+
+    def _classify(self, _):
+        with self._state_lock:
+            letter = self.loop.step()
+            if letter:
+                self.current_letters.append(letter)
                 self.sentence_updated.emit("".join(self.current_letters))
-                
-                # Reset for the next letter
-                self.prediction_buffer = ""
-                self.buffer_counter = 0
-                self.last_known_prediction = ""
-    
-        # Emit the fully annotated frame to the UI.
-        rgb_image = cv2.cvtColor(annotated_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+
+    def _emit_frame(self, annotated_frame):
+        now = time.monotonic()
+        if now - self._last_display_time < self.display_interval:
+            self.display_stats["skipped_rate"] += 1
+            return
+        if not self._frame_consumed.is_set():
+            # The GUI has not drawn the last frame yet; don't queue up more.
+            self.display_stats["skipped_busy"] += 1
+            return
+
+        qt_image = self._to_qimage(annotated_frame)
+        self._frame_consumed.clear()
+        self._last_display_time = now
+        self.display_stats["emitted"] += 1
         self.frame_ready.emit(qt_image)
 
+    @timed("camera_qimage_seconds", "Scaling and QImage conversion of a preview frame.")
+    def _to_qimage(self, annotated_frame):
+        display_frame = self._scale_for_display(annotated_frame)
+        h, w, ch = display_frame.shape
+        bytes_per_line = ch * w
+        # BGR888 lets Qt read the OpenCV frame directly, without a second
+        # colour conversion. The wrapper only borrows display_frame, which is
+        # the pipeline's own frame or the reused scaling buffer, and the image
+        # crosses threads through a queued signal; copy() gives it its own
+        # pixels so the next frame cannot overwrite one still being painted.
+        return QImage(display_frame.data, w, h, bytes_per_line, QImage.Format.Format_BGR888).copy()
+
+    def _scale_for_display(self, frame):
+        """Scales the frame into a reused buffer that fits the video label, keeping the aspect ratio."""
+        if not self.display_size:
+            return frame
+        frame_h, frame_w = frame.shape[:2]
+        label_w, label_h = self.display_size
+        scale = min(label_w / frame_w, label_h / frame_h)
+        target_w, target_h = max(int(frame_w * scale), 1), max(int(frame_h * scale), 1)
+        if (target_w, target_h) == (frame_w, frame_h):
+            return frame
+
+        if self._display_buffer is None or self._display_buffer.shape[:2] != (target_h, target_w):
+            self._display_buffer = np.empty((target_h, target_w, 3), dtype=np.uint8)
+        cv2.resize(frame, (target_w, target_h), dst=self._display_buffer, interpolation=cv2.INTER_LINEAR)
+        return self._display_buffer
+
     @pyqtSlot()
     def save_current_word(self):
-        # This function remains the same
-        if not self.current_letters: return
-        word = "".join(self.current_letters)
-        self.words.append(word)
-        self.current_letters = []
-        self.prediction_buffer = ""
-        self.buffer_counter = 0
-        self.sentence_updated.emit("")
-        self.full_sentence_updated.emit(" ".join(self.words))
+        with self._state_lock:
+            if not self.current_letters: return
+            word = "".join(self.current_letters)
+            self.words.append(word)
+            self.current_letters = []
+            self.loop.reset_letter()
+            self.sentence_updated.emit("")
+            self.full_sentence_updated.emit(" ".join(self.words))
 
     @pyqtSlot()
     def clear_all(self):
         # Reset all state variables
-        self.current_letters = []
-        self.words = []
-        self.prediction_buffer = ""
-        self.buffer_counter = 0
-        self.frame_count = 0
-        self.last_known_prediction = ""
-        self.sentence_updated.emit("")
-        self.full_sentence_updated.emit("")
+        with self._state_lock:
+            self.current_letters = []
+            self.words = []
+            self.loop.reset()
+            self.sentence_updated.emit("")
+            self.full_sentence_updated.emit("")
 
     def get_full_sentence(self):
-        # This function remains the same
-        if self.current_letters:
-            self.save_current_word()
-        sentence = " ".join(self.words)
-        self.clear_all()
-        return sentence
\ No newline at end of file
+        with self._state_lock:
+            if self.current_letters:
+                self.save_current_word()
+            sentence = " ".join(self.words)
+            self.clear_all()
+            return sentence
\ No newline at end of file
@@ -0,0 +1,98 @@
+# frame_pipeline.py
+
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """
+    A small bounded hand-off queue between two pipeline stages.
+
+    Producers never block: when the queue is full the oldest item is dropped.
+    Consumers always receive the newest item, and anything older still waiting
+    is discarded as stale. Both kinds of discard are counted.
+    """
+    def __init__(self, name, maxsize=2):
+        self.name = name
+        self.maxsize = maxsize
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.received += 1
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """Returns the newest item, or None if nothing arrived within the timeout or the queue was closed."""
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        """Wakes up any waiting consumer; further gets return None once empty."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {"depth": len(self._items), "received": self.received, "dropped": self.dropped}
+
+
+class PipelineStage(threading.Thread):
+    """
+    Runs one step of the frame pipeline on its own thread.
+
+    A stage without an input queue is a source and calls work() in a loop;
+    otherwise it calls work(item) for the newest item of its input queue.
+    """
+    def __init__(self, name, work, input_queue=None, poll_interval=0.1):
+        super().__init__(name=name, daemon=True)
+        self.work = work
+        self.input_queue = input_queue
+        self.poll_interval = poll_interval
+        self.processed = 0
+        self.last_duration = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            if self.input_queue is None:
+                item = None
+            else:
+                item = self.input_queue.get(timeout=self.poll_interval)
+                if item is None:
+                    continue
+            start = time.perf_counter()
+            try:
+                if self.input_queue is None:
+                    self.work()
+                else:
+                    self.work(item)
+            except Exception as e:
+                print(f"ERROR: Pipeline stage '{self.name}' failed. Details: {e}")
+            self.last_duration = time.perf_counter() - start
+            self.processed += 1
+
+    def stop(self):
+        self._stop_event.set()
+        if self.input_queue is not None:
+            self.input_queue.close()
+
+    def stats(self):
+        return {"processed": self.processed, "last_duration_ms": self.last_duration * 1000}
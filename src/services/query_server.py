@@ -0,0 +1,311 @@
+# query_server.py
+"""
+Headless HTTP front end for the correction + NLP pipeline, so thin kiosk
+clients and signage can share one warm backend.
+
+Routes (JSON in and out):
+    POST /query   {"text": "dmntoilet", "stand_id": "stand_pintu_timur"}
+    POST /batch   {"requests": [{"text": ..., "stand_id": ...}, ...]}
+    GET  /health
+    GET  /metrics (Prometheus text)
+
+Connections are handled concurrently on one asyncio loop. Sentences from all
+connections are gathered into micro-batches (up to QUERY_BATCH_MAX_SIZE, or
+whatever arrives within QUERY_BATCH_WINDOW seconds) and answered on a worker
+thread, so the event loop never blocks on NLP work. A batch that raises is
+retried one sentence at a time, so one bad sentence cannot fail the others.
+
+Usage:
+    python main.py --serve --port 8765
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from src.config.config import AppConfig
+from src.core.metrics import REGISTRY
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_HEADER_LINES = 100
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class QueryServer:
+    def __init__(self, pipeline, host=None, port=None, max_batch_size=None, batch_window=None):
+        self.pipeline = pipeline
+        self.host = host or AppConfig.QUERY_SERVER_HOST
+        self.port = AppConfig.QUERY_SERVER_PORT if port is None else port
+        self.max_batch_size = max_batch_size or AppConfig.QUERY_BATCH_MAX_SIZE
+        self.batch_window = AppConfig.QUERY_BATCH_WINDOW if batch_window is None else batch_window
+
+        self._server = None
+        self._pending = None # asyncio.Queue of (stand_id, text, future)
+        self._batch_task = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-worker")
+        self.started_at = time.monotonic()
+        self.counters = {"requests": 0, "errors": 0, "sentences": 0, "batches": 0, "duplicates": 0}
+        self.latency = REGISTRY.histogram("query_server_request_seconds", "Time to answer one HTTP request.") \
+            if REGISTRY.enabled else None
+
+    async def start(self):
+        """Starts listening. With port 0 the chosen port is stored in self.port."""
+        self._pending = asyncio.Queue()
+        self._batch_task = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Query server listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+        self._executor.shutdown(wait=False)
+
+    # Batching
+
+    async def answer(self, text, stand_id=None):
+        """Queues one sentence for the next batch and waits for its answer."""
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((stand_id, text, future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Identical questions in one batch are answered once; sent
+            # separately they would all miss the cache together
+            waiting = {} # (stand_id, text) -> futures of the requests asking it
+            for stand_id, text, future in batch:
+                waiting.setdefault((stand_id, text), []).append(future)
+            requests = list(waiting)
+            self.counters["duplicates"] += len(batch) - len(requests)
+            try:
+                results = await loop.run_in_executor(self._executor, self.pipeline.process_batch, requests)
+            except Exception as e:
+                if len(requests) > 1:
+                    print(f"WARNING: A batch of {len(requests)} queries failed, answering them one by one. Details: {e}")
+                await self._answer_individually(waiting)
+                continue
+            self.counters["batches"] += 1
+            self.counters["sentences"] += len(batch)
+            for request, result in zip(requests, results):
+                self._set_result(waiting[request], result)
+
+    async def _answer_individually(self, waiting):
+        """Fallback after a failed batch, so only the sentence that breaks the pipeline gets the error."""
+        loop = asyncio.get_running_loop()
+        for request, futures in waiting.items():
+            try:
+                results = await loop.run_in_executor(self._executor, self.pipeline.process_batch, [request])
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.counters["batches"] += 1
+            self.counters["sentences"] += len(futures)
+            self._set_result(futures, results[0])
+
+    @staticmethod
+    def _set_result(futures, result):
+        for future in futures:
+            if not future.done():
+                future.set_result(dict(result)) # One copy per client
+
+    # HTTP
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._send(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                start = time.perf_counter()
+                self.counters["requests"] += 1
+                try:
+                    status, payload = await self._route(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    print(f"ERROR: Query failed. Details: {e}")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}
+                if status >= 400:
+                    self.counters["errors"] += 1
+                await self._send(writer, status, payload, keep_alive)
+                if self.latency is not None:
+                    self.latency.observe(time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Parses one HTTP/1.1 request. Returns None when the client closed the connection."""
+        request_line = await self._readline(reader, HTTPStatus.BAD_REQUEST, "request line too long")
+        if not request_line:
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split(" ", 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._readline(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "too many headers")
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    @staticmethod
+    async def _readline(reader, status, message):
+        """readline() that turns a line over the stream limit into an HttpError."""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HttpError(status, message)
+
+    async def _send(self, writer, status, payload, keep_alive=True):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), "application/json"
+        status = HTTPStatus(status)
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _route(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.health()
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.render_metrics()
+        if path == "/query" and method == "POST":
+            item = self._parse_item(self._parse_json(body))
+            return HTTPStatus.OK, await self.answer(*item)
+        if path == "/batch" and method == "POST":
+            items = self._parse_json(body).get("requests")
+            if not isinstance(items, list):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "'requests' must be a list")
+            parsed = [self._parse_item(item) for item in items]
+            responses = await asyncio.gather(*(self.answer(*item) for item in parsed))
+            return HTTPStatus.OK, {"responses": list(responses)}
+        if path in ("/health", "/metrics", "/query", "/batch"):
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        raise HttpError(HTTPStatus.NOT_FOUND, f"no route for {path}")
+
+    @staticmethod
+    def _parse_json(body):
+        try:
+            data = json.loads(body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+        return data
+
+    @staticmethod
+    def _parse_item(item):
+        """Returns (text, stand_id) from a request object."""
+        if not isinstance(item, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "each request must be a JSON object")
+        text = item.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'text' must be a non-empty string")
+        stand_id = item.get("stand_id")
+        if stand_id is not None and not isinstance(stand_id, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'stand_id' must be a string")
+        return text, stand_id
+
+    def health(self):
+        store = self.pipeline.nlp_engine.store
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.monotonic() - self.started_at, 3),
+            "text_correction": self.pipeline.text_processor is not None,
+            "knowledge": store.stats(),
+            "query_cache": self.pipeline.cache_stats(),
+            "stands": self.pipeline.nlp_engine.known_stands(),
+            "pending": self._pending.qsize() if self._pending else 0,
+        }
+
+    def render_metrics(self):
+        lines = []
+        for name, value in self.counters.items():
+            metric = f"query_server_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        lines += ["# TYPE query_server_knowledge_version gauge",
+                  f"query_server_knowledge_version {self.pipeline.nlp_engine.store.stats()['version']}"]
+        cache = self.pipeline.cache_stats()
+        if cache is not None:
+            for name in ("hits", "misses", "evictions", "invalidations"):
+                metric = f"query_cache_{name}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {cache[name]}"]
+            for name in ("size", "hit_rate"):
+                lines += [f"# TYPE query_cache_{name} gauge", f"query_cache_{name} {cache[name]}"]
+        return "\n".join(lines) + "\n" + REGISTRY.render()
+
+
+def build_pipeline():
+    """Loads the text processor and NLP engine the same way the desktop app does."""
+    from src.core.query_pipeline import QueryPipeline
+    from src.core.text_processor import TextProcessor
+    return QueryPipeline(TextProcessor())
+
+
+def serve(host=None, port=None):
+    """Runs the query server until interrupted."""
+    server = QueryServer(build_pipeline(), host, port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Query server stopped.")
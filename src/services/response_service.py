@@ -1,9 +1,6 @@
 # response_service.py
 
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
-from src.core.mall_nlp import MallNLP
-# You may need a text processor for spell correction, assumed to be passed in.
-# from src.core.text_processor import TextProcessor 
 
 class ResponseService(QObject):
     """Handles final text processing via the NLP engine and packages the response."""
@@ -11,10 +8,25 @@ class ResponseService(QObject):
     # This signal emits a dictionary, allowing it to carry a rich payload to the UI.
     response_ready = pyqtSignal(dict)
 
-    def __init__(self, text_processor):
+    def __init__(self, pipeline=None):
         super().__init__()
-        self.nlp_engine = MallNLP()
-        self.text_processor = text_processor # Use a shared text processor for correction
+        # Correction + NLP (a QueryPipeline, shared with the headless query
+        # server). Built by StartupService in the background, so the NLP
+        # indexes never load on the GUI thread.
+        self.pipeline = pipeline
+
+    @property
+    def nlp_engine(self):
+        return self.pipeline.nlp_engine if self.pipeline is not None else None
+
+    def set_pipeline(self, pipeline):
+        """Attaches the query pipeline once it has been loaded in the background."""
+        self.pipeline = pipeline
+
+    def set_text_processor(self, text_processor):
+        """Attaches a text processor to the current pipeline."""
+        if self.pipeline is not None:
+            self.pipeline.set_text_processor(text_processor)
 
     @pyqtSlot(str)
     def process_final_sentence(self, text):
@@ -25,20 +37,16 @@ class ResponseService(QObject):
         if not text.strip(): 
             return 
 
-        # Auto-Correction Step 
         print(f"ResponseService received raw text: '{text}'")
-        corrected_text = self.text_processor.correct_sentence(text)
-        print(f"Corrected to: '{corrected_text}'")
-        
-        # NLP Processing Step 
-        # Call the new method that returns both an answer and suggestions
-        answer, suggestions = self.nlp_engine.process_sentence_with_suggestions(corrected_text)
-
-        response_data = {
-            "question": corrected_text,
-            "answer": answer,
-            "suggestions": suggestions
-        }
+        if self.pipeline is None:
+            # Startup failed to build the NLP engine (see the startup report)
+            self.response_ready.emit({"question": text, "answer": "Maaf, layanan belum siap. Silakan coba lagi.",
+                                      "suggestions": []})
+            return
+
+        # Auto-Correction and NLP Processing Steps
+        response_data = self.pipeline.process(text)
+        print(f"Corrected to: '{response_data['question']}'")
 
         # Emit the complete package
-        self.response_ready.emit(response_data)
\ No newline at end of file
+        self.response_ready.emit(response_data)
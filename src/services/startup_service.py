@@ -0,0 +1,112 @@
+# startup_service.py
+
+import time
+import threading
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class StartupReport:
+    """Collects how long each startup phase took, in the order they finished, and which components failed."""
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases = []
+        self.errors = [] # (component, message) for components that could not be loaded
+        self._lock = threading.Lock() # Phases are recorded from the GUI and loader threads
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.phases.append((name, seconds))
+
+    def add_error(self, component, error):
+        with self._lock:
+            self.errors.append((component, str(error)))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def elapsed(self):
+        """Wall-clock seconds since the report was created."""
+        return time.perf_counter() - self.started_at
+
+    def as_dict(self):
+        with self._lock:
+            return {name: seconds for name, seconds in self.phases}
+
+    def format(self):
+        """Returns a printable breakdown of the startup phases."""
+        with self._lock:
+            phases = list(self.phases)
+            errors = list(self.errors)
+        width = max((len(name) for name, _ in phases), default=0)
+        lines = ["Startup timing report:"]
+        for name, seconds in phases:
+            lines.append(f"  {name:<{width}}  {seconds * 1000:8.1f} ms")
+        lines.append(f"  {'total (wall)':<{width}}  {self.elapsed() * 1000:8.1f} ms")
+        for component, message in errors:
+            lines.append(f"  FAILED {component}: {message}")
+        return "\n".join(lines)
+
+
+class StartupService(QObject):
+    """
+    Builds the heavy components (text processor vocabulary, query pipeline
+    with the NLP indexes, sign recognizer, MediaPipe graph) on a worker
+    thread while the welcome splash is shown, then warms them up and hands
+    them back to the GUI thread.
+    """
+    components_ready = pyqtSignal(dict)
+
+    def __init__(self, report=None):
+        super().__init__()
+        self.report = report or StartupReport()
+
+    @pyqtSlot()
+    def load(self):
+        # A failed component must not keep the splash up forever: without the
+        # text processor text is answered uncorrected, and the text entry mode
+        # still works without the recognizer.
+        text_processor = None
+        try:
+            with self.report.phase("import text processor"):
+                from src.core.text_processor import TextProcessor
+            with self.report.phase("text processor vocabulary"):
+                text_processor = TextProcessor()
+        except Exception as e:
+            print(f"ERROR: Could not load the text processor. Details: {e}")
+            self.report.add_error("text processor", e)
+
+        # Without the pipeline questions get a "not ready" answer instead of a crash
+        pipeline = None
+        try:
+            with self.report.phase("import query pipeline"):
+                from src.core.query_pipeline import QueryPipeline
+            with self.report.phase("query pipeline"):
+                pipeline = QueryPipeline(text_processor)
+        except Exception as e:
+            print(f"ERROR: Could not load the NLP engine. Details: {e}")
+            self.report.add_error("query pipeline", e)
+
+        recognizer = None
+        try:
+            # Imported here so TensorFlow/MediaPipe never load on the GUI thread.
+            with self.report.phase("import recognizer"):
+                from src.core.sign_recognizer import SignRecognizer
+            recognizer = SignRecognizer()
+            recognizer.warm_up()
+            for name, seconds in recognizer.load_timings.items():
+                self.report.add(f"recognizer {name}", seconds)
+        except Exception as e:
+            print(f"ERROR: Could not load the sign recognizer. Details: {e}")
+            self.report.add_error("sign recognizer", e)
+
+        self.components_ready.emit({
+            "text_processor": text_processor,
+            "pipeline": pipeline,
+            "recognizer": recognizer,
+        })
@@ -0,0 +1,29 @@
+# suggestion_service.py
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from src.config.config import AppConfig
+
+
+class SuggestionService(QObject):
+    """
+    Looks up autocomplete suggestions on its own thread, so typing never
+    waits on the vocabulary. Each request carries an id that is echoed back
+    with the result, which lets the page ignore answers to outdated text.
+    """
+    suggestions_ready = pyqtSignal(int, list)
+
+    def __init__(self, text_processor=None):
+        super().__init__()
+        self.text_processor = text_processor
+
+    def set_text_processor(self, text_processor):
+        """Attaches the shared text processor once it has been loaded in the background."""
+        self.text_processor = text_processor
+
+    @pyqtSlot(int, str)
+    def request_suggestions(self, request_id, current_text):
+        if self.text_processor is None:
+            suggestions = []
+        else:
+            suggestions = self.text_processor.get_suggestions(current_text, AppConfig.SUGGESTION_LIMIT)
+        self.suggestions_ready.emit(request_id, suggestions)
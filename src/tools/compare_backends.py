@@ -0,0 +1,138 @@
+# compare_backends.py
+"""
+Scores every classifier backend on a landmark dataset, to pick the cheapest
+one that meets the accuracy bar on a given machine.
+
+For each backend it reports load time, accuracy, single-frame latency (the
+"last_frame" prediction mode) and window latency (one batched call over
+SEQUENCE_LENGTH frames, the "window" mode).
+
+Accuracy alone hides how a backend behaves at the recognizer's
+CONFIDENCE_THRESHOLD (--threshold), so it also reports:
+    coverage   share of samples predicted at or above the threshold
+    accepted   accuracy of those accepted predictions
+    wrong>=t   share of the misclassified samples that still pass it
+    random>=t  share of random hands (noise, normalized like real ones) that pass it
+
+The dataset defaults to NEIGHBOR_DATASET_PATH. A landmark CSV can be given
+instead; it is converted into a dataset directory next to it on first use.
+
+The "knn" and "centroid" backends are built from landmark data, so scoring
+them on the samples they index would be meaningless. With --holdout (the
+default) they are rebuilt from the remaining samples and every backend is
+scored on the held-out ones only. --holdout 0 loads them from
+NEIGHBOR_DATASET_PATH instead, for scoring on a separate test dataset.
+
+Usage:
+    python -m src.tools.compare_backends
+    python -m src.tools.compare_backends --dataset data/test_landmarks --holdout 0 --backends numpy tflite knn
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from src.config.config import AppConfig
+from src.core.classifier_backends import CLASSIFIER_BACKENDS, load_classifier
+from src.core.landmark_dataset import open_dataset
+from src.core.landmark_normalization import normalize_landmarks
+from src.core.neighbor_classifiers import NearestCentroidClassifier, NearestNeighborClassifier, training_arrays
+from src.tools.export_tflite import single_sample_latency
+
+# Backends rebuilt from the training part of the split when holding out samples
+NEIGHBOR_BUILDERS = {
+    "knn": lambda landmarks, labels, num_classes: NearestNeighborClassifier(
+        landmarks, labels, num_classes, AppConfig.KNN_NEIGHBORS),
+    "centroid": lambda landmarks, labels, num_classes: NearestCentroidClassifier(landmarks, labels, num_classes),
+}
+
+
+def split(count, holdout, seed):
+    """Returns (train indexes, test indexes); everything is test when holdout is 0."""
+    if not holdout:
+        return np.arange(0), np.arange(count)
+    order = np.random.default_rng(seed).permutation(count)
+    test_count = max(1, int(round(count * holdout)))
+    return np.sort(order[test_count:]), np.sort(order[:test_count])
+
+
+def random_hands(count, seed):
+    """Uniform noise landmarks, normalized like real hands, that no backend should accept."""
+    return normalize_landmarks(np.random.default_rng(seed).uniform(size=(count, 21, 3)))
+
+
+def score(name, model, load_seconds, landmarks, targets, noise, threshold, runs):
+    probabilities = np.asarray(model.predict(landmarks, verbose=0))
+    predictions = np.argmax(probabilities, axis=1)
+    correct = predictions == targets
+    accepted = probabilities.max(axis=1) >= threshold
+    window = landmarks[:AppConfig.SEQUENCE_LENGTH]
+    return {
+        "backend": name,
+        "accuracy": float(np.mean(correct)),
+        "coverage": float(np.mean(accepted)),
+        "accepted_accuracy": float(np.mean(correct[accepted])) if accepted.any() else 0.0,
+        "wrong_accepted": float(np.mean(accepted[~correct])) if not correct.all() else 0.0,
+        "random_accepted": float(np.mean(np.asarray(model.predict(noise, verbose=0)).max(axis=1) >= threshold)),
+        "load_ms": load_seconds * 1000,
+        "frame_us": single_sample_latency(model, landmarks[:1], runs) * 1e6,
+        "window_us": single_sample_latency(model, window, runs) * 1e6,
+    }
+
+
+def format_rows(rows, count, threshold):
+    lines = [f"Scored on {count} samples, confidence threshold {threshold:g}",
+             f"{'backend':<10}{'accuracy':>10}{'coverage':>10}{'accepted':>10}{'wrong>=t':>10}{'random>=t':>11}"
+             f"{'load (ms)':>11}{'frame (us)':>12}{'window (us)':>13}"]
+    for row in sorted(rows, key=lambda row: row["frame_us"]):
+        lines.append(f"{row['backend']:<10}{row['accuracy'] * 100:>9.2f}%{row['coverage'] * 100:>9.2f}%"
+                     f"{row['accepted_accuracy'] * 100:>9.2f}%{row['wrong_accepted'] * 100:>9.2f}%"
+                     f"{row['random_accepted'] * 100:>10.2f}%"
+                     f"{row['load_ms']:>11.1f}{row['frame_us']:>12.1f}{row['window_us']:>13.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare accuracy and latency of the classifier backends.")
+    parser.add_argument("--dataset", default=AppConfig.NEIGHBOR_DATASET_PATH,
+                        help="Landmark dataset directory, or a CSV to convert next to itself")
+    parser.add_argument("--backends", nargs="+", default=[name for name in CLASSIFIER_BACKENDS if name != "keras"],
+                        help="Backends to score (keras is slow to load; add it explicitly)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for scoring; 0 scores everything")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=AppConfig.CONFIDENCE_THRESHOLD,
+                        help="Confidence a prediction needs to be accepted")
+    parser.add_argument("--random-hands", type=int, default=1000, help="Noise samples for the random>=t column")
+    parser.add_argument("--runs", type=int, default=300, help="Calls timed per latency figure")
+    parser.add_argument("--json", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    with open(AppConfig.LABELS_PATH, 'r') as f:
+        class_names = json.load(f)
+    landmarks, labels = training_arrays(open_dataset(args.dataset), class_names)
+    train, test = split(len(labels), args.holdout, args.seed)
+    if not args.holdout and os.path.abspath(args.dataset) == os.path.abspath(AppConfig.NEIGHBOR_DATASET_PATH):
+        print("WARNING: Scoring on NEIGHBOR_DATASET_PATH without a holdout; knn and centroid have seen every sample.")
+    test_landmarks = landmarks[test].reshape(len(test), 21, 3)
+    noise = random_hands(args.random_hands, args.seed)
+
+    rows = []
+    for name in args.backends:
+        start = time.perf_counter()
+        if args.holdout and name in NEIGHBOR_BUILDERS:
+            model = NEIGHBOR_BUILDERS[name](landmarks[train], labels[train], len(class_names))
+        else:
+            model = load_classifier(name, class_names)
+        load_seconds = time.perf_counter() - start
+        rows.append(score(name, model, load_seconds, test_landmarks, labels[test], noise, args.threshold, args.runs))
+
+    print()
+    print(format_rows(rows, len(test), args.threshold))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
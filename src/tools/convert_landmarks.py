@@ -0,0 +1,80 @@
+# convert_landmarks.py
+"""
+Converts a landmark CSV into the memory-mapped dataset format of
+src/core/landmark_dataset.py, and reports how long each format takes to load.
+
+Usage:
+    python -m src.tools.convert_landmarks data/sibi_alphabet_landmarks.csv
+    python -m src.tools.convert_landmarks data/train_landmarks.csv data/train --normalize
+    python -m src.tools.convert_landmarks data/train --info
+"""
+
+import argparse
+import csv
+import os
+import time
+import numpy as np
+from src.core.landmark_dataset import LandmarkDataset, convert_csv, is_dataset
+from src.core.landmark_normalization import normalize_landmarks
+
+
+def load_csv(csv_path):
+    """The old way: parse the whole CSV, then normalize. Returns (landmarks, label names)."""
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        rows = [row for row in reader if row]
+    return normalize_landmarks(np.asarray([row[1:] for row in rows], dtype=np.float32)), [row[0] for row in rows]
+
+
+def describe(dataset):
+    size = sum(os.path.getsize(os.path.join(dataset.path, name)) for name in os.listdir(dataset.path))
+    counts = ", ".join(f"{name} {count}" for name, count in dataset.class_counts().items())
+    return (f"{dataset.path}: {len(dataset)} samples, {len(dataset.classes)} classes, "
+            f"{'normalized' if dataset.normalized else 'raw'} landmarks, {size / 1e6:.1f} MB\n  {counts}")
+
+
+def compare_load_times(csv_path, dataset_path):
+    start = time.perf_counter()
+    load_csv(csv_path)
+    csv_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dataset = LandmarkDataset(dataset_path)
+    open_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in dataset.iter_batches(1024):
+        pass
+    batches_seconds = time.perf_counter() - start
+
+    print(f"Parse CSV + normalize:        {csv_seconds * 1000:9.1f} ms")
+    print(f"Open dataset (memory-mapped): {open_seconds * 1000:9.1f} ms")
+    print(f"Stream every batch:           {batches_seconds * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a landmark CSV into a memory-mapped dataset.")
+    parser.add_argument("source", help="Landmark CSV (or a dataset directory with --info)")
+    parser.add_argument("output", nargs="?", help="Dataset directory (default: the CSV path without .csv)")
+    parser.add_argument("--normalize", action="store_true", help="Store normalized landmarks instead of raw ones")
+    parser.add_argument("--chunk-rows", type=int, default=65536, help="CSV rows parsed into memory at a time")
+    parser.add_argument("--info", action="store_true", help="Only describe an existing dataset")
+    args = parser.parse_args()
+
+    if args.info:
+        if not is_dataset(args.source):
+            parser.error(f"'{args.source}' is not a dataset directory")
+        print(describe(LandmarkDataset(args.source)))
+        return
+
+    output = args.output or os.path.splitext(args.source)[0]
+    start = time.perf_counter()
+    dataset = convert_csv(args.source, output, args.normalize, args.chunk_rows)
+    print(f"Converted in {time.perf_counter() - start:.2f} s")
+    print(describe(dataset))
+    compare_load_times(args.source, output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# export_tflite.py
+"""
+Exports the Keras SIBI model to TFLite flatbuffers and compares them with it.
+
+Variants:
+    fp32  plain conversion, as a reference
+    fp16  float16 weights (half the size, float math)
+    int8  full integer model with int8 input/output, calibrated on
+          landmarks from the dataset (normalized exactly as at runtime)
+
+After exporting, every variant is scored against the .h5 model (through
+Keras and the NumPy backend) on the dataset: accuracy, top-1 agreement with
+Keras, single-sample latency and file size. Select the result at runtime
+with AppConfig.INFERENCE_BACKEND = "tflite" and TFLITE_MODEL_PATH.
+
+Needs full TensorFlow for the conversion; the app itself then only needs a
+TFLite interpreter.
+
+Usage:
+    python -m src.tools.export_tflite
+    python -m src.tools.export_tflite --dataset data/train_landmarks --variants int8 --output-dir models
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from src.config.config import AppConfig
+from src.core.landmark_dataset import open_dataset
+
+VARIANTS = ("fp32", "fp16", "int8")
+
+
+def dataset_targets(dataset, class_names):
+    """The dataset's labels as indexes into the model's classes (config/labels.json)."""
+    missing = [name for name in dataset.classes if name not in class_names]
+    if missing:
+        raise ValueError(f"Dataset classes {missing} are not in the model's labels.")
+    remap = np.array([class_names.index(name) for name in dataset.classes])
+    return remap[np.asarray(dataset.labels)]
+
+
+def convert(keras_model, variant, dataset=None, calibration_samples=500, seed=0):
+    """Returns the TFLite flatbuffer bytes for one variant."""
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    if variant == "fp16":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif variant == "int8":
+        order = np.random.default_rng(seed).permutation(len(dataset))[:calibration_samples]
+        calibration, _ = dataset.read(np.sort(order))
+
+        def representative_dataset():
+            for sample in calibration:
+                yield [sample[np.newaxis]]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif variant != "fp32":
+        raise ValueError(f"Unknown variant: '{variant}'")
+    return converter.convert()
+
+
+def single_sample_latency(model, sample, runs):
+    """Median seconds of one predict() call on a single (1, 21, 3) sample, after a warm-up."""
+    model.predict(sample, verbose=0)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.predict(sample, verbose=0)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def evaluate(name, model, landmarks, targets, reference, size_bytes, runs):
+    probabilities = np.asarray(model.predict(landmarks, verbose=0))
+    predictions = np.argmax(probabilities, axis=1)
+    return {
+        "model": name,
+        "accuracy": float(np.mean(predictions == targets)),
+        "agreement": float(np.mean(predictions == reference)) if reference is not None else 1.0,
+        "latency_us": single_sample_latency(model, landmarks[:1], runs) * 1e6,
+        "size_kb": size_bytes / 1024,
+    }, predictions
+
+
+def format_comparison(rows, count):
+    lines = [f"Evaluated on {count} samples",
+             f"{'model':<16}{'accuracy':>10}{'agreement':>11}{'latency (us)':>14}{'size (KB)':>11}"]
+    for row in rows:
+        lines.append(f"{row['model']:<16}{row['accuracy'] * 100:>9.2f}%{row['agreement'] * 100:>10.2f}%"
+                     f"{row['latency_us']:>14.1f}{row['size_kb']:>11.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Keras model to TFLite and compare the variants.")
+    parser.add_argument("--model", default=AppConfig.MODEL_PATH, help="Keras .h5 model")
+    parser.add_argument("--dataset", default="data/sibi_alphabet_landmarks.csv",
+                        help="Landmark dataset directory or CSV, for int8 calibration and the comparison")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=["fp16", "int8"])
+    parser.add_argument("--output-dir", help="Where the .tflite files go (default: next to the model)")
+    parser.add_argument("--calibration-samples", type=int, default=500, help="Landmark samples used to calibrate int8")
+    parser.add_argument("--runs", type=int, default=300, help="Single-sample calls timed per model")
+    parser.add_argument("--json", help="Also write the comparison as JSON to this path")
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+    from src.core.numpy_classifier import NumpyClassifier
+    from src.core.tflite_classifier import TFLiteClassifier
+
+    dataset = open_dataset(args.dataset)
+    with open(AppConfig.LABELS_PATH, 'r') as f:
+        class_names = json.load(f)
+    landmarks, _ = dataset.read(slice(None))
+    targets = dataset_targets(dataset, class_names)
+
+    keras_model = load_model(args.model)
+    model_size = os.path.getsize(args.model)
+    rows = []
+    row, reference = evaluate("keras (.h5)", keras_model, landmarks, targets, None, model_size, args.runs)
+    rows.append(row)
+    rows.append(evaluate("numpy (.h5)", NumpyClassifier(args.model), landmarks, targets, reference,
+                         model_size, args.runs)[0])
+
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.model))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.model))[0]
+    for variant in args.variants:
+        path = os.path.join(output_dir, f"{stem}_{variant}.tflite")
+        start = time.perf_counter()
+        flatbuffer = convert(keras_model, variant, dataset, args.calibration_samples)
+        with open(path, 'wb') as f:
+            f.write(flatbuffer)
+        print(f"Wrote '{path}' ({len(flatbuffer) / 1024:.1f} KB) in {time.perf_counter() - start:.1f} s")
+        classifier = TFLiteClassifier(path, AppConfig.TFLITE_NUM_THREADS)
+        rows.append(evaluate(f"tflite {variant}", classifier, landmarks, targets, reference,
+                             len(flatbuffer), args.runs)[0])
+
+    print()
+    print(format_comparison(rows, len(dataset)))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
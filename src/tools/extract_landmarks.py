@@ -0,0 +1,173 @@
+# extract_landmarks.py
+"""
+Parallel, resumable hand landmark extraction from image datasets.
+
+Images are labelled by their parent folder (data/SIBI/A/001.jpg -> "A"), as
+in the training notebook. The paths are sharded across a process pool with
+one MediaPipe Hands(static_image_mode=True) instance per worker, and every
+result is appended to the output CSV as soon as it arrives. The CSV has the
+notebook's layout: label, x0, y0, z0, ..., z20 (raw, not normalized).
+
+Next to the CSV a done log (<output>.done) records every processed image,
+including the ones where no hand was found. Re-running the same command
+skips everything in the log, so an interrupted run continues where it
+stopped instead of starting over.
+
+Usage:
+    python -m src.tools.extract_landmarks data/SIBI data/ASL/train -o data/train_landmarks.csv
+    python -m src.tools.extract_landmarks recordings/ -o data/inhouse.csv --workers 8 --labels ABCDEFGHIJKLMNOPQRSTUVWXYZ
+"""
+
+import argparse
+import csv
+import os
+import time
+from multiprocessing import Pool
+from src.core.landmark_normalization import NUM_LANDMARKS
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+CSV_HEADER = ['label'] + [f'{axis}{i}' for i in range(NUM_LANDMARKS) for axis in ['x', 'y', 'z']]
+PROGRESS_EVERY = 500 # Images between progress lines
+
+_hands = None # The MediaPipe Hands instance of this worker process
+
+
+def find_images(sources, labels=None):
+    """
+    Returns sorted (path, label) pairs for every image below the source
+    directories, labelled by parent folder. With `labels`, other folders
+    are skipped.
+    """
+    images = []
+    for source in sources:
+        for root, _, files in os.walk(source):
+            label = os.path.basename(root).upper()
+            if labels and label not in labels:
+                continue
+            for name in files:
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    images.append((os.path.normpath(os.path.join(root, name)), label))
+    images.sort()
+    return images
+
+
+def _init_worker(min_detection_confidence):
+    global _hands
+    import mediapipe as mp
+    _hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1,
+                                      min_detection_confidence=min_detection_confidence)
+
+
+def _extract(item):
+    """Runs in a worker. Returns (path, label, [63 floats] or None)."""
+    import cv2
+    path, label = item
+    image = cv2.imread(path)
+    if image is None:
+        return path, label, None
+    results = _hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.multi_hand_landmarks:
+        return path, label, None
+    landmarks = [value for lm in results.multi_hand_landmarks[0].landmark for value in (lm.x, lm.y, lm.z)]
+    return path, label, landmarks
+
+
+def _read_complete_lines(path):
+    """Returns the newline-terminated lines of a file; a partial last line (from a crash) is dropped."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        lines = f.read().split('\n')
+    return [line + '\n' for line in lines[:-1]]
+
+
+def recover(output_path, done_path):
+    """
+    Brings the CSV and the done log back in step after an interrupted run
+    and returns the set of image paths already processed.
+
+    Each CSV row is flushed before its done-log entry, so the CSV can only
+    be ahead of the log: rows beyond what the log accounts for (and any
+    half-written line) are cut off and those images are simply redone.
+    """
+    header = ','.join(CSV_HEADER)
+    done_lines = _read_complete_lines(done_path)
+    csv_lines = _read_complete_lines(output_path)
+    if csv_lines and csv_lines[0].rstrip('\r\n') != header:
+        raise ValueError(f"'{output_path}' exists but is not a landmark CSV; refusing to append to it.")
+    if len(csv_lines) > 1 and not os.path.exists(done_path):
+        raise ValueError(f"'{output_path}' already has rows but no '{done_path}'; it was not written "
+                         "by this tool, so it is left alone. Move it away to extract again.")
+
+    entries = [line.rstrip('\n').rsplit('\t', 1) for line in done_lines]
+    expected_rows = sum(1 for _, found in entries if found == '1')
+    if entries and len(csv_lines) < 1 + expected_rows:
+        # Only possible if the CSV was deleted or edited by hand; redo everything rather than guess
+        print(f"Warning: '{output_path}' has fewer rows than '{done_path}' records; starting over.")
+        done_lines, entries, expected_rows = [], [], 0
+    csv_lines = csv_lines[:1 + expected_rows] or [header + '\r\n']
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(csv_lines)
+    with open(done_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(done_lines)
+    return {path for path, _ in entries}
+
+
+def extract_landmarks(images, output_path, workers=None, min_detection_confidence=0.5, chunksize=16):
+    """
+    Extracts landmarks for (path, label) pairs into `output_path`, skipping
+    images a previous run already processed. Returns a summary dict.
+    """
+    done_path = output_path + '.done'
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    done = recover(output_path, done_path)
+    pending = [item for item in images if item[0] not in done]
+    workers = workers or os.cpu_count() or 1
+    print(f"{len(images)} images, {len(images) - len(pending)} already done, "
+          f"{len(pending)} to process with {workers} workers")
+
+    summary = {"images": len(images), "skipped": len(images) - len(pending), "processed": 0, "hands": 0, "seconds": 0.0}
+    if not pending:
+        return summary
+
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8', newline='') as csv_file, \
+            open(done_path, 'a', encoding='utf-8', newline='') as done_file, \
+            Pool(workers, initializer=_init_worker, initargs=(min_detection_confidence,)) as pool:
+        writer = csv.writer(csv_file)
+        for path, label, landmarks in pool.imap_unordered(_extract, pending, chunksize):
+            if landmarks is not None:
+                writer.writerow([label] + landmarks)
+                csv_file.flush() # The row must be on disk before the log says it is done
+                summary["hands"] += 1
+            done_file.write(f"{path}\t{int(landmarks is not None)}\n")
+            done_file.flush()
+            summary["processed"] += 1
+            if summary["processed"] % PROGRESS_EVERY == 0:
+                rate = summary["processed"] / (time.perf_counter() - start)
+                print(f"  {summary['processed']}/{len(pending)} images ({rate:.1f}/s), {summary['hands']} hands")
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from labelled image folders into a CSV.")
+    parser.add_argument("sources", nargs="+", help="Directories of images, one sub-folder per label")
+    parser.add_argument("-o", "--output", required=True, help="Landmark CSV to write (appended to when resuming)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--labels", help="Only these labels, e.g. ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    parser.add_argument("--min-detection-confidence", type=float, default=0.5)
+    parser.add_argument("--chunksize", type=int, default=16, help="Images handed to a worker at a time")
+    args = parser.parse_args()
+
+    images = find_images(args.sources, set(args.labels.upper()) if args.labels else None)
+    summary = extract_landmarks(images, args.output, args.workers, args.min_detection_confidence, args.chunksize)
+    if summary["processed"]:
+        print(f"Processed {summary['processed']} images in {summary['seconds']:.1f} s "
+              f"({summary['processed'] / summary['seconds']:.1f}/s); hands found in {summary['hands']}.")
+    print(f"Landmarks saved to '{args.output}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# nlp_benchmark.py
+"""
+Compares the compiled keyword automaton used by MallNLP against the old
+linear keyword scan, on a synthetic knowledge base the size of a mall chain
+(or on a real one with --knowledge-base).
+
+Usage:
+    python -m src.tools.nlp_benchmark --entries 5000 --queries 2000
+    python -m src.tools.nlp_benchmark --knowledge-base config/knowledge_base.json
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from src.core.mall_nlp import MallNLP
+
+FILLER_WORDS = ["di", "mana", "lokasi", "tolong", "saya", "cari", "ada", "yang", "dekat", "sini"]
+
+
+def linear_scan_entity(knowledge_base, sentence):
+    """The previous MallNLP._find_entity: first entry with any keyword in the sentence."""
+    for key, data in knowledge_base.items():
+        search_terms = data.get('keywords', []) + [key.replace('_', ' ')]
+        if any(term in sentence for term in search_terms):
+            return key
+    return None
+
+
+def synthetic_knowledge_base(entries, keywords_per_entry, rng):
+    def word():
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+    knowledge_base = {}
+    while len(knowledge_base) < entries:
+        key = f"{word()}_{word()}"
+        knowledge_base[key] = {"keywords": [word() for _ in range(keywords_per_entry)]}
+    return knowledge_base
+
+
+def synthetic_queries(knowledge_base, count, rng):
+    keys = list(knowledge_base)
+    queries = []
+    for _ in range(count):
+        data = knowledge_base[rng.choice(keys)]
+        words = rng.sample(FILLER_WORDS, 3) + [rng.choice(data["keywords"])]
+        rng.shuffle(words)
+        queries.append(" ".join(words))
+    # Some queries that match nothing, the worst case for the linear scan
+    queries += [" ".join(rng.sample(FILLER_WORDS, 4)) for _ in range(count // 10)]
+    return queries
+
+
+def time_per_query(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MallNLP keyword matching.")
+    parser.add_argument("--knowledge-base", help="Use this knowledge base JSON instead of a synthetic one")
+    parser.add_argument("--entries", type=int, default=5000, help="Synthetic knowledge-base entries")
+    parser.add_argument("--keywords", type=int, default=5, help="Keywords per synthetic entry")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.knowledge_base:
+        with open(args.knowledge_base, 'r', encoding='utf-8') as f:
+            knowledge_base = json.load(f)
+    else:
+        knowledge_base = synthetic_knowledge_base(args.entries, args.keywords, rng)
+    queries = synthetic_queries(knowledge_base, args.queries, rng)
+
+    start = time.perf_counter()
+    entity_matcher, _ = MallNLP.build_matchers(knowledge_base, {})
+    build_seconds = time.perf_counter() - start
+
+    scan_seconds, scan_results = time_per_query(lambda q: linear_scan_entity(knowledge_base, q), queries)
+    matcher_seconds, matcher_results = time_per_query(entity_matcher.best, queries)
+
+    # Both must agree on whether anything matched; which entity wins may differ
+    # because the automaton prefers the longest keyword over dictionary order.
+    found_mismatch = sum((a is None) != (b is None) for a, b in zip(scan_results, matcher_results))
+    same_entity = sum(a == b for a, b in zip(scan_results, matcher_results))
+
+    print(f"Knowledge base: {len(knowledge_base)} entries, {len(entity_matcher)} keywords, {len(queries)} queries")
+    print(f"Automaton build:  {build_seconds * 1000:10.1f} ms (once, at load)")
+    print(f"Linear scan:      {scan_seconds * 1e6:10.1f} us/query")
+    print(f"Keyword automaton:{matcher_seconds * 1e6:10.1f} us/query ({scan_seconds / matcher_seconds:.0f}x faster)")
+    print(f"Same entity chosen: {same_entity}/{len(queries)}, found/not-found disagreements: {found_mismatch}")
+
+
+if __name__ == '__main__':
+    main()
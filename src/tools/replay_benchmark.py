@@ -0,0 +1,232 @@
+# replay_benchmark.py
+"""
+Headless replay of the recognition pipeline, for catching performance
+regressions without a webcam.
+
+Feeds a video file, a directory of images (labelled by their parent folder,
+as in the training notebook) or the rows of a landmark CSV through the same
+detection -> prediction -> stability logic as CameraService, and reports
+per-stage latency percentiles, effective FPS, committed letters and accuracy.
+For video and images, detection latency is also split by the path that ran:
+the tracked hand ROI ("roi"), the full-frame search ("full_frame"), or a
+lost ROI followed by a full-frame search in the same frame ("roi_lost").
+
+--compare-cadence replays the source twice, with adaptive inference and
+with the fixed every-third-frame cadence. It fails unless both commit every
+confident prediction they make and commit the same number of letters, and
+reports how many of the committed letters match position by position. Where
+they differ, the adaptive scheduler deferred a prediction by a frame and
+classified a different sample (each CSV row is a different hand).
+
+Usage:
+    python -m src.tools.replay_benchmark data/sibi_alphabet_landmarks.csv
+    python -m src.tools.replay_benchmark data/sibi_alphabet_landmarks.csv --compare-cadence
+    python -m src.tools.replay_benchmark recordings/session.mp4 --label A
+    python -m src.tools.replay_benchmark path/to/images --json report.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import cv2
+import numpy as np
+from src.core.recognition_loop import RecognitionLoop
+from src.core.sign_recognizer import SignRecognizer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def iter_csv_landmarks(path):
+    """Yields ((21, 3) raw landmarks, label) for each row of a landmark CSV."""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader) # header
+        for row in reader:
+            yield np.asarray(row[1:], dtype=np.float32).reshape(21, 3), row[0].upper()
+
+
+def iter_image_frames(directory):
+    """Yields (BGR image, label) for every image below `directory`, labelled by parent folder."""
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            image = cv2.imread(os.path.join(root, name))
+            if image is not None:
+                yield image, os.path.basename(root).upper()
+
+
+def iter_video_frames(path, label=None):
+    """Yields (BGR frame, label) for every frame of a video file."""
+    cap = cv2.VideoCapture(path)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame, label
+    finally:
+        cap.release()
+
+
+def percentiles_ms(samples):
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples) * 1000
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"count": len(values), "p50": p50, "p90": p90, "p99": p99, "max": values.max()}
+
+
+def replay(frames, recognizer, loop, fps=30.0, landmarks_only=False, flip=False, max_frames=None):
+    """
+    Runs the frames through the recognizer and recognition loop on a
+    simulated `fps` timeline and returns a report dictionary.
+    """
+    latencies = {"detect": [], "predict": [], "frame": []}
+    letters = []
+    predictions = correct_predictions = confident_predictions = 0
+    committed_with_label = correct_commits = 0
+
+    frame_count = 0
+    wall_start = time.perf_counter()
+    for frame_index, (item, label) in enumerate(frames):
+        if max_frames is not None and frame_index >= max_frames:
+            break
+        frame_count += 1
+        frame_start = time.perf_counter()
+        if landmarks_only:
+            recognizer.push_landmarks(item)
+        else:
+            recognizer.detect_and_draw_landmarks(cv2.flip(item, 1) if flip else item)
+        detect_end = time.perf_counter()
+
+        letter = loop.step(now=frame_index / fps)
+        frame_end = time.perf_counter()
+
+        latencies["detect"].append(detect_end - frame_start)
+        if recognizer.last_detection_path:
+            latencies.setdefault(f"detect_{recognizer.last_detection_path}", []).append(detect_end - frame_start)
+        latencies["frame"].append(frame_end - frame_start)
+        if loop.predicted:
+            latencies["predict"].append(loop.last_predict_seconds)
+            confident_predictions += bool(loop.last_prediction)
+            if loop.last_prediction and label:
+                predictions += 1
+                correct_predictions += loop.last_prediction == label
+        if letter:
+            letters.append(letter)
+            if label:
+                committed_with_label += 1
+                correct_commits += letter == label
+    wall_seconds = time.perf_counter() - wall_start
+
+    return {
+        "frames": frame_count,
+        "wall_seconds": wall_seconds,
+        "effective_fps": frame_count / wall_seconds if wall_seconds else 0.0,
+        "latency_ms": {stage: percentiles_ms(samples) for stage, samples in latencies.items()},
+        "confident_predictions": confident_predictions,
+        "letters_committed": len(letters),
+        "letters": "".join(letters),
+        "prediction_accuracy": correct_predictions / predictions if predictions else None,
+        "commit_accuracy": correct_commits / committed_with_label if committed_with_label else None,
+        "scheduler": loop.scheduler.stats(),
+    }
+
+
+def compare_cadences(make_frames, recognizer, **replay_options):
+    """
+    Replays fresh frames from make_frames() with adaptive inference and with
+    the fixed cadence. Returns {"adaptive": report, "fixed": report,
+    "letter_agreement": fraction, "consistent": bool}.
+    """
+    reports = {}
+    for name, adaptive in (("adaptive", True), ("fixed", False)):
+        recognizer.reset_sequence()
+        loop = RecognitionLoop(recognizer)
+        loop.adaptive_inference = adaptive
+        reports[name] = replay(make_frames(), recognizer, loop, **replay_options)
+    adaptive, fixed = reports["adaptive"]["letters"], reports["fixed"]["letters"]
+    matching = sum(a == b for a, b in zip(adaptive, fixed))
+    reports["letter_agreement"] = matching / max(len(adaptive), len(fixed)) if adaptive or fixed else 1.0
+    reports["consistent"] = len(adaptive) == len(fixed) and all(
+        reports[name]["letters_committed"] == reports[name]["confident_predictions"] for name in ("adaptive", "fixed"))
+    return reports
+
+
+def format_report(report):
+    lines = [
+        f"Replayed {report['frames']} frames in {report['wall_seconds']:.2f} s "
+        f"({report['effective_fps']:.1f} FPS effective)",
+        f"{'stage':<16} {'count':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for stage, stats in report["latency_ms"].items():
+        if not stats["count"]:
+            lines.append(f"{stage:<16} {0:>7}")
+            continue
+        lines.append(f"{stage:<16} {stats['count']:>7} {stats['p50']:>8.3f} {stats['p90']:>8.3f} "
+                     f"{stats['p99']:>8.3f} {stats['max']:>8.3f}")
+    letters = report["letters"]
+    lines.append(f"Letters committed: {report['letters_committed']} of {report['confident_predictions']} "
+                 f"confident predictions "
+                 f"({letters[:40]}{'...' if len(letters) > 40 else ''})")
+    for name in ("prediction_accuracy", "commit_accuracy"):
+        value = report[name]
+        lines.append(f"{name.replace('_', ' ').capitalize()}: {'n/a' if value is None else f'{value * 100:.1f}%'}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded input through the recognition pipeline.")
+    parser.add_argument("source", help="Landmark CSV, video file or image directory")
+    parser.add_argument("--label", help="Ground-truth letter for a video source")
+    parser.add_argument("--fps", type=float, default=30.0, help="Simulated frame rate for the scheduler timeline")
+    parser.add_argument("--flip", action="store_true", help="Mirror frames like the live camera does")
+    parser.add_argument("--max-frames", type=int, help="Stop after this many frames")
+    parser.add_argument("--compare-cadence", action="store_true",
+                        help="Replay with adaptive and fixed cadence and check both commit every confident prediction")
+    parser.add_argument("--json", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    landmarks_only = args.source.lower().endswith('.csv')
+
+    def make_frames():
+        if landmarks_only:
+            return iter_csv_landmarks(args.source)
+        if os.path.isdir(args.source):
+            return iter_image_frames(args.source)
+        return iter_video_frames(args.source, args.label.upper() if args.label else None)
+
+    recognizer = SignRecognizer(detect_hands=not landmarks_only)
+    recognizer.warm_up()
+    options = {"fps": args.fps, "landmarks_only": landmarks_only, "flip": args.flip, "max_frames": args.max_frames}
+    try:
+        if args.compare_cadence:
+            report = compare_cadences(make_frames, recognizer, **options)
+        else:
+            report = replay(make_frames(), recognizer, RecognitionLoop(recognizer), **options)
+    finally:
+        recognizer.close()
+
+    if args.compare_cadence:
+        for name in ("adaptive", "fixed"):
+            print(f"{name.capitalize()} cadence:")
+            print(format_report(report[name]))
+            print()
+        print(f"Letters matching between the cadences: {report['letter_agreement'] * 100:.1f}%")
+        print(f"Both cadences commit every confident prediction, the same number of letters: "
+              f"{'yes' if report['consistent'] else 'NO'}")
+    else:
+        print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=float)
+    if args.compare_cadence and not report["consistent"]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
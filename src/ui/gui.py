@@ -8,24 +8,34 @@ from PyQt6.QtCore import Qt, QThread, QMetaObject
 from src.ui.welcome_page import WelcomePage
 from src.services.response_service import ResponseService
 from src.services.camera_service import CameraService
+from src.services.suggestion_service import SuggestionService
 from src.ui.response_page import ResponsePage
-from src.core.text_processor import TextProcessor
+from src.services.startup_service import StartupService, StartupReport
+from src.core.metrics import start_exporters_from_config
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.startup_report = StartupReport()
+        start_exporters_from_config()
         self.setWindowTitle("EmergenSee AI Assistant")
         self.setGeometry(100, 100, 400, 700)
         self.setStyleSheet("background-color: #222222;")
         
-        self.text_processor = TextProcessor()
+        # The text processor, query pipeline and recognizer are built in the
+        # background while the welcome page is shown (see _on_components_ready).
+        self.text_processor = None
 
-        self.response_service = ResponseService(self.text_processor)
+        self.response_service = ResponseService()
         self.camera_service = CameraService()
         self.camera_thread = QThread()
         self.camera_service.moveToThread(self.camera_thread)
         self.camera_thread.start()
         self.response_service.response_ready.connect(self.handle_response)
+        self.suggestion_service = SuggestionService()
+        self.suggestion_thread = QThread()
+        self.suggestion_service.moveToThread(self.suggestion_thread)
+        self.suggestion_thread.start()
 
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
@@ -33,7 +43,7 @@ class MainWindow(QMainWindow):
         self.welcome_page = WelcomePage(self)
         self.mode_selection_page = ModeSelectionPage(self)
         self.record_page = RecordPage(self, self.camera_service, self.response_service)
-        self.text_entry_page = TextEntryPage(self, self.response_service, self.text_processor)
+        self.text_entry_page = TextEntryPage(self, self.response_service, self.suggestion_service)
         self.response_page = ResponsePage(self)
 
         self.stacked_widget.addWidget(self.welcome_page)
@@ -43,6 +53,25 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.response_page)
 
         self.navigateToPage(0)
+        self.startup_report.add("main window", self.startup_report.elapsed())
+
+        self.startup_service = StartupService(self.startup_report)
+        self.startup_thread = QThread()
+        self.startup_service.moveToThread(self.startup_thread)
+        self.startup_thread.started.connect(self.startup_service.load)
+        self.startup_service.components_ready.connect(self._on_components_ready)
+        self.startup_thread.start()
+
+    def _on_components_ready(self, components):
+        """Hands the background-loaded components to the services and pages."""
+        self.text_processor = components["text_processor"]
+        self.response_service.set_pipeline(components["pipeline"])
+        self.suggestion_service.set_text_processor(self.text_processor)
+        self.camera_service.set_recognizer(components["recognizer"])
+
+        self.startup_thread.quit()
+        print(self.startup_report.format())
+        self.welcome_page.mark_ready()
 
     def navigateToPage(self, index):
         self.stacked_widget.setCurrentIndex(index)
@@ -57,4 +86,8 @@ class MainWindow(QMainWindow):
         self.camera_service.stop_camera()
         self.camera_thread.quit()
         self.camera_thread.wait()
+        self.suggestion_thread.quit()
+        self.suggestion_thread.wait()
+        self.startup_thread.quit()
+        self.startup_thread.wait()
         event.accept()
\ No newline at end of file
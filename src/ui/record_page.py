@@ -1,7 +1,7 @@
 import sys
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QSizePolicy)
 from PyQt6.QtGui import QFont, QPixmap, QImage
-from PyQt6.QtCore import Qt, QMetaObject, pyqtSlot, Q_ARG
+from PyQt6.QtCore import Qt, QMetaObject, pyqtSlot, Q_ARG, QEvent
 
 class RecordPage(QWidget):
     def __init__(self, parent, camera_service, response_service):
@@ -46,6 +46,8 @@ class RecordPage(QWidget):
         self.video_label.setFont(QFont("Arial", 16))
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.video_label.setMinimumSize(1, 1) # Don't let the current pixmap dictate the label size
+        self.video_label.installEventFilter(self) # Forward resizes to the camera worker
         self.video_label.setStyleSheet("background-color: transparent; color: #555;")
 
         controls_layout = QHBoxLayout()
@@ -113,6 +115,7 @@ class RecordPage(QWidget):
     def toggle_recording(self):
         self.is_recording = not self.is_recording
         if self.is_recording:
+            self._report_video_size()
             self.helper_text.setText("Press button to finish recording")
             self.record_btn.setStyleSheet("QPushButton { background-color: #990000; border-radius: 55px; border: 5px solid white; }")
             QMetaObject.invokeMethod(self.camera_service, "start_camera", Qt.ConnectionType.QueuedConnection)
@@ -141,16 +144,24 @@ class RecordPage(QWidget):
             self.stop_and_reset()
         self.parent.navigateToPage(1)
 
+    def eventFilter(self, watched, event):
+        if watched is self.video_label and event.type() == QEvent.Type.Resize:
+            self._report_video_size()
+        return super().eventFilter(watched, event)
+
+    def _report_video_size(self):
+        """Tells the camera worker what size to scale frames to."""
+        size = self.video_label.size()
+        self.camera_service.set_display_size(size.width(), size.height())
+
     @pyqtSlot(QImage)
     def update_video_frame(self, qt_image):
+        # Frames arrive already scaled by the camera worker.
         if self.is_recording:
             self.video_label.setText("") 
-            scaled_pixmap = QPixmap.fromImage(qt_image).scaled(
-            self.video_label.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.video_label.setPixmap(scaled_pixmap)
+            self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+        # Always release the frame, or the worker stops sending new ones.
+        self.camera_service.mark_frame_consumed()
 
     @pyqtSlot(str)
     def update_live_translation(self, current_letters):
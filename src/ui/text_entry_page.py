@@ -1,14 +1,24 @@
 import sys
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QTextEdit, QListWidget)                             
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt,  QMetaObject, Q_ARG
+from PyQt6.QtCore import Qt,  QMetaObject, Q_ARG, QTimer
+from src.config.config import AppConfig
+from src.core.prefix_index import apply_completion
 
 class TextEntryPage(QWidget):
-    def __init__(self, parent, response_service, text_processor):
+    def __init__(self, parent, response_service, suggestion_service):
         super().__init__(parent)
         self.parent = parent
         self.response_service = response_service
-        self.text_processor = text_processor
+        self.suggestion_service = suggestion_service
+        self.suggestion_service.suggestions_ready.connect(self.show_suggestions)
+        self.suggestion_request_id = 0 # Only the answer to the latest request is shown
+
+        # Restarted on every keystroke; suggestions are looked up once typing pauses
+        self.suggestion_timer = QTimer(self)
+        self.suggestion_timer.setSingleShot(True)
+        self.suggestion_timer.setInterval(AppConfig.SUGGESTION_DEBOUNCE_MS)
+        self.suggestion_timer.timeout.connect(self.request_suggestions)
 
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -51,8 +61,17 @@ class TextEntryPage(QWidget):
         self.suggestion_list.itemClicked.connect(self.apply_suggestion)
 
     def update_suggestions(self):
-        current_text = self.text_input.toPlainText()
-        suggestions = self.text_processor.get_suggestions(current_text)
+        # Invalidate any lookup in flight; its text is already outdated
+        self.suggestion_request_id += 1
+        self.suggestion_timer.start()
+
+    def request_suggestions(self):
+        QMetaObject.invokeMethod(self.suggestion_service, "request_suggestions", Qt.ConnectionType.QueuedConnection,
+                                 Q_ARG(int, self.suggestion_request_id), Q_ARG(str, self.text_input.toPlainText()))
+
+    def show_suggestions(self, request_id, suggestions):
+        if request_id != self.suggestion_request_id:
+            return
         self.suggestion_list.clear()
         if suggestions:
             self.suggestion_list.addItems(suggestions)
@@ -63,9 +82,7 @@ class TextEntryPage(QWidget):
     def apply_suggestion(self, item):
         suggestion = item.text()
         current_text = self.text_input.toPlainText()
-        words = current_text.split()
-        words[-1] = suggestion # Replace the partial word
-        new_text = " ".join(words) + " "
+        new_text = apply_completion(current_text, suggestion) # Replace the partial word(s)
         self.text_input.setText(new_text)
         self.suggestion_list.hide()
 
@@ -22,23 +22,45 @@ class WelcomePage(QWidget):
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         logo_label.setStyleSheet("color: white;")
 
+        self.status_label = QLabel("Loading...")
+        self.status_label.setFont(QFont("Arial", 12))
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setStyleSheet("color: white;")
+
         layout.addWidget(welcome_label)
         layout.addWidget(logo_label)
+        layout.addWidget(self.status_label)
         
         self.timer = None
+        # The splash stays up until both the minimum display time has passed
+        # and the background loader has finished.
+        self.min_time_elapsed = False
+        self.components_ready = False
 
     def showEvent(self, event):
         """This method is called every time the widget is shown."""
         # Start the timer whenever the page becomes visible.
         if self.timer is None:
+            self.min_time_elapsed = False
             self.timer = self.startTimer(2000) 
         super().showEvent(event)
 
+    def mark_ready(self):
+        """Called by the main window once the background components are loaded."""
+        self.components_ready = True
+        self.status_label.setText("")
+        self._navigate_if_done()
+
+    def _navigate_if_done(self):
+        if self.min_time_elapsed and self.components_ready and self.isVisible():
+            self.parent.navigateToPage(1)
+
     def timerEvent(self, event):
         """This method is called when the timer finishes."""
         if self.timer is not None:
             self.killTimer(self.timer)
             self.timer = None
         
-        # Navigate to the selection page.
-        self.parent.navigateToPage(1)
+        # Navigate to the selection page once loading is also done.
+        self.min_time_elapsed = True
+        self._navigate_if_done()